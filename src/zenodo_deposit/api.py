@@ -1,17 +1,221 @@
 import requests
-import json
-from typing import Dict, List, Any
+from requests.adapters import HTTPAdapter
+from urllib3.exceptions import NewConnectionError
+from dataclasses import dataclass, field
+from typing import Dict, Iterator, List, Optional, Any, Tuple
 from pathlib import Path
 from urllib.parse import urlparse
 import logging
 import backoff
+from concurrent.futures import ThreadPoolExecutor, as_completed
 import zipfile
-import tempfile
+import io
 import re
+import os
+import posixpath
+import stat
+import functools
+import hashlib
+import mmap
+import threading
+import time
+from contextlib import ExitStack
 
 logger = logging.getLogger(__name__)
 
+# Read size used when streaming local files to Zenodo
+BUFFER_SIZE = 4 * 1024 * 1024
+# Copy size used when writing files into a ZIP archive
+ZIP_BUFFER_SIZE = 1024 * 1024
+# Sizes of the ZIP64 local header extra field and data descriptor zip_stream writes
+_ZIP64_EXTRA_SIZE = 20
+_ZIP64_DATA_DESCRIPTOR_SIZE = 24
+# Files of at least this size are uploaded from a read-only memory map
+MMAP_THRESHOLD = 64 * 1024 * 1024
+# Zenodo accepts at most this many files in a deposition
+MAX_FILES = 100
+# Fewest files worth bundling into one archive when they are all small
+SMALL_FILES_MIN = 20
+
+
+class CircuitOpenError(requests.exceptions.RequestException):
+    """
+    Raised instead of sending a request to a host that keeps failing.
+    """
+
+
+class CircuitBreaker:
+    """
+    Fail fast for a host after too many consecutive server errors.
+
+    After fail_max failures in a row the circuit opens and requests fail with
+    CircuitOpenError until reset_timeout seconds have passed. Then a single probe
+    request is let through; if it succeeds the circuit closes again, otherwise it
+    stays open for another reset_timeout.
+    """
+
+    def __init__(self, fail_max: int = 5, reset_timeout: float = 60):
+        self.fail_max = fail_max
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at = None
+        self._lock = threading.Lock()
+
+    def before_request(self, url: str) -> None:
+        with self._lock:
+            if self.opened_at is None:
+                return
+            if time.monotonic() - self.opened_at < self.reset_timeout:
+                raise CircuitOpenError(f"Circuit open, not sending request to {url}")
+            # Let this request probe the host; others keep failing fast meanwhile
+            self.opened_at = time.monotonic()
+
+    def record(self, success: bool) -> None:
+        with self._lock:
+            if success:
+                self.failures = 0
+                self.opened_at = None
+                return
+            self.failures += 1
+            if self.failures >= self.fail_max:
+                if self.opened_at is None:
+                    logger.warning(f"Opening circuit after {self.failures} failures")
+                self.opened_at = time.monotonic()
+
+
+class ZenodoSession(requests.Session):
+    """
+    Session that sends the access_token parameter as a bearer token header.
+
+    Keeping the token out of the query string keeps it out of URLs and access logs.
+    Requests without an access_token parameter, such as downloads of source URLs,
+    carry no credentials.
+
+    Each host gets its own CircuitBreaker, so an outage stops every worker from
+    retrying against it while requests to other hosts carry on.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.breakers: Dict[str, CircuitBreaker] = {}
+
+    def request(self, method, url, params=None, *args, **kwargs):
+        # Keep requests.Session.request's signature, so positional callers work
+        if params and "access_token" in params:
+            params = dict(params)
+            auth = {"Authorization": f"Bearer {params.pop('access_token')}"}
+            if len(args) > 1:
+                # headers follows data in the positional parameters
+                args = (args[0], {**(args[1] or {}), **auth}, *args[2:])
+            else:
+                kwargs["headers"] = {**(kwargs.get("headers") or {}), **auth}
+        netloc = urlparse(url).netloc
+        breaker = self.breakers.get(netloc)
+        if breaker is None:
+            # setdefault keeps a single breaker if two workers miss at once
+            breaker = self.breakers.setdefault(netloc, CircuitBreaker())
+        breaker.before_request(url)
+        try:
+            response = super().request(method, url, params, *args, **kwargs)
+        except (requests.exceptions.ConnectionError, requests.exceptions.Timeout):
+            breaker.record(False)
+            raise
+        breaker.record(response.status_code < 500)
+        return response
+
+
+def make_session() -> requests.Session:
+    """
+    Create a requests session with a pooled HTTPS adapter.
+
+    Reusing one session keeps connections to Zenodo alive between calls, so a
+    deposit only pays the TCP and TLS handshake once.
+
+    Returns:
+        requests.Session: The configured session.
+    """
+    session = ZenodoSession()
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=32, max_retries=0)
+    session.mount("https://", adapter)
+    return session
+
+
+_SESSION = make_session()
+
+# HTTP statuses that are worth retrying; anything else is a permanent failure
+RETRY_STATUS_CODES = frozenset({408, 425, 429, 500, 502, 503, 504})
+# Statuses that show a POST was refused without being acted on. After any other
+# failure the server may have created or published something, so resending
+# the POST could do it twice.
+POST_RETRY_STATUS_CODES = frozenset({408, 429})
+
+
+def _not_sent(e: requests.exceptions.RequestException) -> bool:
+    """
+    Check whether a request failed before it reached the server.
+    """
+    if isinstance(e, requests.exceptions.ConnectTimeout):
+        return True
+    if isinstance(e, requests.exceptions.ConnectionError) and e.args:
+        return isinstance(getattr(e.args[0], "reason", None), NewConnectionError)
+    return False
+
+
+def _give_up(e: requests.exceptions.RequestException) -> bool:
+    """
+    Check whether a failed request is not worth retrying.
+
+    Error responses are retried only for statuses in RETRY_STATUS_CODES. Failures
+    without a response are retried only for connection errors and timeouts; the
+    rest, such as an invalid URL or too many redirects, fail the same way again.
+    """
+    if isinstance(e, CircuitOpenError):
+        return True
+    if e.response is not None:
+        return e.response.status_code not in RETRY_STATUS_CODES
+    return not isinstance(
+        e, (requests.exceptions.ConnectionError, requests.exceptions.Timeout)
+    )
+
+
+def _give_up_post(e: requests.exceptions.RequestException) -> bool:
+    """
+    Check whether a failed POST is not worth retrying.
+
+    Only POSTs that the server is known not to have acted on are retried.
+    """
+    if e.response is not None:
+        return e.response.status_code not in POST_RETRY_STATUS_CODES
+    return isinstance(e, CircuitOpenError) or not _not_sent(e)
+
+
+def _backoff(give_up):
+    """
+    Build a retry decorator. Waits start around 2s, never exceed a minute, and
+    stop after two minutes in total.
+    """
+    return backoff.on_exception(
+        backoff.expo,
+        requests.exceptions.RequestException,
+        factor=2,
+        max_value=60,
+        max_tries=6,
+        max_time=120,
+        jitter=backoff.full_jitter,
+        giveup=give_up,
+    )
+
+
+# Retry policy shared by every function that talks to Zenodo
+_retry = _backoff(_give_up)
+# Retry policy for POSTs, which are not safe to repeat
+_retry_post = _backoff(_give_up_post)
 
+
+_NETLOC_RE = re.compile(r"^[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$")
+
+
+@functools.lru_cache(maxsize=4096)
 def valid_url(url: str) -> bool:
     """
     Check if a URL is valid.
@@ -28,7 +232,7 @@ def valid_url(url: str) -> bool:
             return False
         if not parsed.netloc:
             return False
-        if not re.match(r"^[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$", parsed.netloc):
+        if not _NETLOC_RE.match(parsed.netloc):
             return False
         return True
     except ValueError:
@@ -47,7 +251,17 @@ def file_list(path: str) -> List[Path]:
     path = Path(path)
     if path.is_file():
         return [path]
-    return [f for f in Path(path).rglob("*") if f.is_file()]
+    # os.scandir caches each entry's type, so the walk needs no extra stat calls
+    files = []
+    stack = [path]
+    while stack:
+        with os.scandir(stack.pop()) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append(entry.path)
+                elif entry.is_file():
+                    files.append(Path(entry.path))
+    return files
 
 
 def zenodo_url(sandbox: bool = True) -> str:
@@ -67,6 +281,9 @@ def access_token(config: Dict, sandbox: bool = True) -> str:
     """
     Get the access token from the configuration.
 
+    The token is not checked against the API here; a bad token is reported by the
+    first request that uses it.
+
     Args:
         config (Dict): The configuration containing the access token.
         sandbox (bool): Whether to use the Zenodo sandbox or production access token.
@@ -75,29 +292,66 @@ def access_token(config: Dict, sandbox: bool = True) -> str:
         str: The access token.
 
     Raises:
-        ValueError: If the access token is missing or invalid.
+        ValueError: If the access token is missing.
     """
     token_key = "ZENODO_SANDBOX_ACCESS_TOKEN" if sandbox else "ZENODO_ACCESS_TOKEN"
     token = config.get(token_key)
     if not token:
         raise ValueError(f"Access token '{token_key}' is missing in the configuration")
-    # Validate token with a lightweight request
-    try:
-        response = requests.get(f"{zenodo_url(sandbox)}/deposit/depositions", params={"access_token": token})
-        if response.status_code == 403:
-            raise ValueError(f"Invalid or expired access token '{token_key}'. Regenerate at https://sandbox.zenodo.org/account/settings/applications/")
-        response.raise_for_status()
-    except requests.exceptions.HTTPError as e:
-        raise ValueError(f"Failed to validate access token '{token_key}': {str(e)}")
     return token
 
-def create_deposition(base_url: str, params: Dict) -> Dict:
+
+@dataclass(frozen=True)
+class ZenodoClient:
+    """
+    Base URL and access token for one Zenodo environment, resolved once per operation.
+    """
+
+    base_url: str
+    # Kept out of the repr so logging a client does not leak the token
+    token: str = field(repr=False)
+
+    @property
+    def params(self) -> Dict:
+        """
+        Request parameters carrying the access token.
+        """
+        return {"access_token": self.token}
+
+
+def make_client(config: Dict, sandbox: bool = True) -> ZenodoClient:
+    """
+    Resolve the Zenodo base URL and access token for an environment.
+
+    Args:
+        config (Dict): The configuration containing the access token.
+        sandbox (bool): Whether to use the Zenodo sandbox or production.
+
+    Returns:
+        ZenodoClient: The resolved client.
+
+    Raises:
+        ValueError: If the access token is missing.
+    """
+    return ZenodoClient(base_url=zenodo_url(sandbox), token=access_token(config, sandbox))
+
+
+@_retry_post
+def create_deposition(
+    base_url: str,
+    params: Dict,
+    session: requests.Session = None,
+    metadata: Dict = None,
+) -> Dict:
     """
     Create a new deposition on Zenodo.
 
     Args:
         base_url (str): The base URL for the Zenodo API.
         params (Dict): The parameters for the request, including the access token.
+        session (requests.Session): Session to send requests with; defaults to the shared pool.
+        metadata (Dict): Metadata to create the deposition with, saving a separate
+            update request.
 
     Returns:
         Dict: The response from the Zenodo API.
@@ -105,23 +359,44 @@ def create_deposition(base_url: str, params: Dict) -> Dict:
     Raises:
         requests.exceptions.HTTPError: If the API request fails.
     """
-    headers = {"Content-Type": "application/json"}
-    response = requests.post(
-        f"{base_url}/deposit/depositions", params=params, json={}, headers=headers
-    )
-    logger.debug(f"Create deposition response: {response.status_code} {response.text}")
+    session = session or _SESSION
+    body = {"metadata": metadata} if metadata else {}
+    response = session.post(f"{base_url}/deposit/depositions", params=params, json=body)
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug(f"Create deposition response: {response.status_code} {response.text}")
     if response.status_code != 201:
         response.raise_for_status()
     return response.json()
 
 
-@backoff.on_exception(
-    backoff.expo,
-    requests.exceptions.RequestException,
-    max_tries=5,
-    giveup=lambda e: e.response is not None and e.response.status_code < 500,
-)
-def add_url(bucket_url: str, url: str, params: Dict, name: str = None) -> Dict:
+class _SizedStream:
+    """
+    Readable stream that reports a known length.
+
+    requests cannot measure a socket-backed stream such as a response's raw body,
+    so it would send it with chunked transfer encoding. Giving the stream a length
+    makes requests send a Content-Length header and the body as is.
+    """
+
+    def __init__(self, raw, length: int):
+        self._raw = raw
+        self._length = length
+
+    def __len__(self) -> int:
+        return self._length
+
+    def read(self, size: int = -1) -> bytes:
+        return self._raw.read(size)
+
+
+@_retry
+def add_url(
+    bucket_url: str,
+    url: str,
+    params: Dict,
+    name: str = None,
+    session: requests.Session = None,
+) -> Dict:
     """
     Upload a file from a URL to the Zenodo deposition bucket.
 
@@ -130,6 +405,7 @@ def add_url(bucket_url: str, url: str, params: Dict, name: str = None) -> Dict:
         url (str): The path to the file to upload.
         params (Dict): The parameters for the request, including the access token.
         name (str): The name of the file to save as, defaults to the URL name.
+        session (requests.Session): Session to send requests with; defaults to the shared pool.
 
     Returns:
         Dict: The response from the Zenodo API.
@@ -137,26 +413,32 @@ def add_url(bucket_url: str, url: str, params: Dict, name: str = None) -> Dict:
     Raises:
         requests.exceptions.HTTPError: If the API request fails.
     """
+    session = session or _SESSION
     logger.info(f"Uploading URL {url} to Zenodo")
     if not valid_url(url):
         raise ValueError(f"Invalid URL: {url}")
     parsed = urlparse(url)
-    filename = Path(parsed.path).name if not name else name
-    with requests.get(url, stream=True) as r:
+    filename = posixpath.basename(parsed.path) if not name else name
+    with session.get(url, stream=True) as r:
         r.raise_for_status()
-        response = requests.put(
-            f"{bucket_url}/{filename}", data=r.content, params=params
-        )
+        # Stream the download straight into the upload instead of buffering it
+        content_length = r.headers.get("Content-Length")
+        if content_length and not r.headers.get("Content-Encoding"):
+            data = _SizedStream(r.raw, int(content_length))
+        else:
+            data = r.iter_content(chunk_size=1024 * 1024)
+        response = session.put(f"{bucket_url}/{filename}", data=data, params=params)
     response.raise_for_status()
     return response.json()
 
-@backoff.on_exception(
-    backoff.expo,
-    requests.exceptions.RequestException,
-    max_tries=5,
-    giveup=lambda e: e.response is not None and e.response.status_code < 500,
-)
-def add_file(bucket_url: str, file_path: Path, params: Dict, name: str = None) -> Dict:
+@_retry
+def add_file(
+    bucket_url: str,
+    file_path: Path,
+    params: Dict,
+    name: str = None,
+    session: requests.Session = None,
+) -> Dict:
     """
     Upload a single file to the Zenodo deposition bucket.
 
@@ -165,6 +447,7 @@ def add_file(bucket_url: str, file_path: Path, params: Dict, name: str = None) -
         file_path (Path): The path to the file to upload.
         params (Dict): The parameters for the request, including the access token.
         name (str): The name of the file to save as, defaults to the file name.
+        session (requests.Session): Session to send requests with; defaults to the shared pool.
 
     Returns:
         Dict: The response from the Zenodo API.
@@ -172,31 +455,134 @@ def add_file(bucket_url: str, file_path: Path, params: Dict, name: str = None) -
     Raises:
         requests.exceptions.HTTPError: If the API request fails.
     """
+    session = session or _SESSION
     logger.info(f"Uploading file {file_path} to Zenodo")
     file_path = Path(file_path)
     if not file_path.is_file():
         raise ValueError(f"Not a file: {file_path}")
     filename = file_path.name if not name else name
-    with open(file_path, "rb") as fp:
-        response = requests.put(f"{bucket_url}/{filename}", data=fp, params=params)
+    size = file_path.stat().st_size
+    headers = {
+        "Content-Length": str(size),
+        "Content-Type": "application/octet-stream",
+    }
+    with ExitStack() as stack:
+        body = stack.enter_context(open(file_path, "rb", buffering=BUFFER_SIZE))
+        if size >= MMAP_THRESHOLD:
+            # Let the page cache feed the socket instead of copying through a buffer
+            body = stack.enter_context(
+                mmap.mmap(body.fileno(), 0, access=mmap.ACCESS_READ)
+            )
+        response = session.put(
+            f"{bucket_url}/{filename}", data=body, params=params, headers=headers
+        )
     response.raise_for_status()
     return response.json()
 
-def add_directory(bucket_url: str, directory: str, params: Dict, names: List[str] = []) -> List[Dict]:
+@_retry
+def bucket_files(
+    bucket_url: str,
+    params: Dict,
+    session: requests.Session = None,
+) -> Dict[str, Dict]:
+    """
+    List the files already in a Zenodo deposition bucket.
+
+    Args:
+        bucket_url (str): The URL of the deposition bucket.
+        params (Dict): The parameters for the request, including the access token.
+        session (requests.Session): Session to send requests with; defaults to the shared pool.
+
+    Returns:
+        Dict[str, Dict]: The bucket's files, keyed by file name.
+
+    Raises:
+        requests.exceptions.HTTPError: If the API request fails.
+    """
+    session = session or _SESSION
+    response = session.get(bucket_url, params=params)
+    response.raise_for_status()
+    return {item["key"]: item for item in response.json().get("contents", [])}
+
+
+def file_md5(file_path: Path) -> str:
+    """
+    Compute the MD5 digest of a local file, in the form Zenodo reports checksums.
+
+    Args:
+        file_path: The local file.
+
+    Returns:
+        str: The checksum as "md5:<hex digest>".
+    """
+    with open(file_path, "rb", buffering=BUFFER_SIZE) as fp:
+        return f"md5:{hashlib.file_digest(fp, 'md5').hexdigest()}"
+
+
+def already_uploaded(
+    file_path: Path, name: str, existing: Dict[str, Dict] = None
+) -> Optional[Dict]:
+    """
+    Find a file in the bucket listing that matches a local file's name, size and checksum.
+
+    The checksum is only computed when the name and size already match.
+
+    Args:
+        file_path: The local file.
+        name: The name the file is saved as in the bucket.
+        existing: Files already in the bucket, from bucket_files.
+
+    Returns:
+        Optional[Dict]: The bucket entry if the file is already uploaded, else None.
+    """
+    entry = existing.get(name) if existing else None
+    if not entry or entry.get("size") != file_path.stat().st_size:
+        return None
+    checksum = entry.get("checksum")
+    if checksum and checksum != file_md5(file_path):
+        return None
+    logger.info(f"Skipping {file_path}, already uploaded as {name}")
+    return entry
+
+
+def add_directory(
+    bucket_url: str,
+    directory: str,
+    params: Dict,
+    names: List[str] = None,
+    max_workers: int = 8,
+    existing: Dict[str, Dict] = None,
+    session: requests.Session = None,
+    max_files: int = MAX_FILES,
+    zip_below_bytes: int = 0,
+) -> List[Dict]:
     """
     Upload all files in a directory to the Zenodo deposition bucket.
 
+    Files are uploaded concurrently, since each one is an independent PUT to the bucket.
+    The directory is uploaded as a single ZIP archive instead when it holds more than
+    max_files files. If zip_below_bytes is set, it is also zipped when it holds more
+    than SMALL_FILES_MIN files that add up to less than zip_below_bytes, unless
+    existing is given: a resumed upload keeps skipping the files already there
+    rather than sending a new archive each time.
+
     Args:
         bucket_url: The URL of the deposition bucket.
         directory: The path to the directory to upload.
         params: Parameters for the request, including access token.
         names: List of names to save files as; defaults to original filenames if shorter than number of files.
+        max_workers: Maximum number of files to upload at the same time.
+        existing: Files already in the bucket, from bucket_files; matching files are skipped.
+        session: Session to send requests with; defaults to the shared pool.
+        max_files: Most files to upload one by one; Zenodo allows 100 per deposition.
+        zip_below_bytes: Zip many small files whose total size is below this; 0, the
+            default, never does.
 
     Returns:
-        List[Dict]: List of responses from the Zenodo API.
+        List[Dict]: List of responses from the Zenodo API, in the same order as the files.
 
     Raises:
-        ValueError: If the directory is invalid or contains too many files (>100).
+        ValueError: If the directory is invalid.
         requests.exceptions.HTTPError: If the API request fails.
     """
     logger.info(f"Uploading files in {directory} to Zenodo")
@@ -204,29 +590,193 @@ def add_directory(bucket_url: str, directory: str, params: Dict, names: List[str
     if not directory.is_dir():
         raise ValueError(f"Not a directory: {directory}")
     files = file_list(directory)
+    names = list(names or [])
     if len(names) < len(files):
         names += [None] * (len(files) - len(names))
 
-    if len(files) > 100:
-        logger.warning("Uploading more than 100 files. Zipping the directory.")
-        return [add_zipped_directory(bucket_url, directory, params)]
-    responses = []
-    for file, name in zip(files, names):
-        responses.append(add_file(bucket_url, file, params, name))
+    if len(files) > max_files:
+        logger.warning(f"Uploading more than {max_files} files. Zipping the directory.")
+        zip_directory = True
+    elif zip_below_bytes and existing is None and len(files) > SMALL_FILES_MIN:
+        zip_directory = sum(file.stat().st_size for file in files) < zip_below_bytes
+        if zip_directory:
+            logger.info(f"Zipping {len(files)} small files in {directory}")
+    else:
+        zip_directory = False
+    if zip_directory:
+        return [
+            add_zipped_directory(
+                bucket_url, directory, params, files=files, session=session
+            )
+        ]
+    responses = [None] * len(files)
+    errors = []
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = {}
+        for index, (file, name) in enumerate(zip(files, names)):
+            uploaded = already_uploaded(file, name or file.name, existing)
+            if uploaded:
+                responses[index] = uploaded
+                continue
+            future = executor.submit(
+                add_file, bucket_url, file, params, name, session=session
+            )
+            futures[future] = index
+        for future in as_completed(futures):
+            index = futures[future]
+            try:
+                responses[index] = future.result()
+            except Exception as e:
+                logger.error(f"Failed to upload {files[index]}: {e}")
+                errors.append(e)
+    if errors:
+        raise errors[0]
     return responses
 
 
+class _ZipBuffer(io.RawIOBase):
+    """
+    Unseekable sink that collects the bytes ZipFile writes until they are drained.
+    """
+
+    def __init__(self):
+        self._chunks = []
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, b) -> int:
+        self._chunks.append(bytes(b))
+        return len(b)
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+def zip_members(directory: Path, files: List[Path]) -> List[Tuple[Path, zipfile.ZipInfo]]:
+    """
+    Describe files in a directory as members of a ZIP archive.
+
+    Args:
+        directory: The directory that member names are made relative to.
+        files: The files to put in the archive.
+
+    Returns:
+        List[Tuple[Path, zipfile.ZipInfo]]: Each file with its archive entry.
+    """
+    return [
+        (file, zipfile.ZipInfo.from_file(file, file.relative_to(directory)))
+        for file in files
+    ]
+
+
+def zip_size(members: List[Tuple[Path, zipfile.ZipInfo]]) -> int:
+    """
+    Compute the size of the archive zip_stream writes for the given members.
+
+    Members are stored uncompressed, so the size only depends on their names and
+    sizes. Each member has a local header with a ZIP64 extra field, its data, and
+    a ZIP64 data descriptor; the central directory entries carry a ZIP64 extra
+    field only for sizes or offsets beyond the classic limits.
+
+    Args:
+        members: The archive members, from zip_members.
+
+    Returns:
+        int: The archive size in bytes.
+    """
+    offset = 0
+    central_size = 0
+    for _, info in members:
+        name_size = len(info.filename.encode("utf-8"))
+        # Each ZIP64 field in the central directory holds one 8-byte value
+        zip64_values = 2 if info.file_size > zipfile.ZIP64_LIMIT else 0
+        if offset > zipfile.ZIP64_LIMIT:
+            zip64_values += 1
+        central_size += zipfile.sizeCentralDir + name_size
+        if zip64_values:
+            central_size += 4 + 8 * zip64_values
+        offset += (
+            zipfile.sizeFileHeader + name_size + _ZIP64_EXTRA_SIZE
+            + info.file_size + _ZIP64_DATA_DESCRIPTOR_SIZE
+        )
+    size = offset + central_size + zipfile.sizeEndCentDir
+    if (
+        len(members) > zipfile.ZIP_FILECOUNT_LIMIT
+        or offset > zipfile.ZIP64_LIMIT
+        or central_size > zipfile.ZIP64_LIMIT
+    ):
+        size += zipfile.sizeEndCentDir64 + zipfile.sizeEndCentDir64Locator
+    return size
+
+
+def zip_stream(members: List[Tuple[Path, zipfile.ZipInfo]]) -> Iterator[bytes]:
+    """
+    Generate a ZIP archive of files, chunk by chunk.
+
+    The archive is produced as it is read, so it never has to be written to disk
+    or held in memory as a whole.
+
+    Args:
+        members: The archive members, from zip_members.
+
+    Yields:
+        bytes: The next chunk of the archive.
+    """
+    buffer = _ZipBuffer()
+    with zipfile.ZipFile(
+        buffer, "w", compression=zipfile.ZIP_STORED, allowZip64=True
+    ) as z:
+        for file, info in members:
+            with open(file, "rb") as src, z.open(info, "w", force_zip64=True) as dst:
+                while chunk := src.read(ZIP_BUFFER_SIZE):
+                    dst.write(chunk)
+                    yield buffer.drain()
+    yield buffer.drain()
+
+
+class _SizedChunks:
+    """
+    Iterable of body chunks that reports their total length, so requests sends
+    a Content-Length header instead of using chunked transfer encoding.
+    """
+
+    def __init__(self, chunks: Iterator[bytes], length: int):
+        self._chunks = chunks
+        self._length = length
+
+    def __iter__(self) -> Iterator[bytes]:
+        return iter(self._chunks)
+
+    def __len__(self) -> int:
+        return self._length
+
+
+@_retry
 def add_zipped_directory(
-    bucket_url: str, directory: str, params: Dict, name: str = None
+    bucket_url: str,
+    directory: str,
+    params: Dict,
+    name: str = None,
+    files: List[Path] = None,
+    session: requests.Session = None,
 ) -> Dict:
     """
     Create a ZIP file of a directory and upload it to the Zenodo deposition bucket.
 
+    The archive is streamed into the upload as it is built, without a temporary file.
+    Its size is computed up front, so it is sent with a Content-Length rather than
+    chunked.
+
     Args:
         bucket_url: The URL of the deposition bucket.
         directory: The path to the directory to upload.
         params: Parameters for the request, including access token.
         name: The name to save the ZIP file as, defaults to directory name + '.zip'.
+        files: The files in the directory, if already listed; saves walking it again.
+        session: Session to send requests with; defaults to the shared pool.
 
     Returns:
         Dict: The response from the Zenodo API.
@@ -235,6 +785,7 @@ def add_zipped_directory(
         ValueError: If the directory is invalid.
         requests.exceptions.HTTPError: If the API request fails.
     """
+    session = session or _SESSION
     logger.info(f"Zipping and uploading {directory} to Zenodo")
     directory = Path(directory)
     if not directory.is_dir():
@@ -243,19 +794,52 @@ def add_zipped_directory(
         name = f"{directory.name}.zip"
     else:
         name = f"{name}.zip"
-    temp_filename = Path(tempfile.gettempdir()) / name
-    with zipfile.ZipFile(temp_filename, "w") as z:
-        for file in file_list(directory):
-            z.write(file, file.relative_to(directory))
+    members = zip_members(directory, files if files is not None else file_list(directory))
+    # Zenodo's bucket expects a known length, which a stored archive has
+    response = session.put(
+        f"{bucket_url}/{name}",
+        data=_SizedChunks(zip_stream(members), zip_size(members)),
+        params=params,
+    )
+    response.raise_for_status()
+    return response.json()
+
+
+def path_kind(thing: str) -> Optional[str]:
+    """
+    Classify a path as a URL, a file, or a directory, using at most one stat call.
+
+    Args:
+        thing: Path to a file, a URL, or a directory.
+
+    Returns:
+        Optional[str]: "url", "file", "dir", "other" for anything else that exists,
+        or None if the path does not exist and is not a valid URL.
+    """
+    if valid_url(thing):
+        return "url"
     try:
-        result = add_file(bucket_url, temp_filename, params, name)
-    finally:
-        temp_filename.unlink()
-    return result
+        mode = os.stat(thing).st_mode
+    except (OSError, ValueError):
+        return None
+    if stat.S_ISDIR(mode):
+        return "dir"
+    if stat.S_ISREG(mode):
+        return "file"
+    return "other"
 
 
 def add_thing(
-    bucket_url: str, thing: str, params: Dict, name: str = None, zip: bool = False
+    bucket_url: str,
+    thing: str,
+    params: Dict,
+    name: str = None,
+    zip: bool = False,
+    kind: str = None,
+    existing: Dict[str, Dict] = None,
+    session: requests.Session = None,
+    max_files: int = MAX_FILES,
+    zip_below_bytes: int = 0,
 ) -> Dict:
     """
     Upload a file, URL, or directory to the Zenodo deposition bucket.
@@ -266,6 +850,11 @@ def add_thing(
         params: Parameters for the request, including access token.
         name: The name to save the file as, defaults to the original name.
         zip: If True, zip directories before uploading.
+        kind: The result of path_kind(thing), if the caller already has it.
+        existing: Files already in the bucket, from bucket_files; matching files are skipped.
+        session: Session to send requests with; defaults to the shared pool.
+        max_files: Most files in a directory to upload one by one; see add_directory.
+        zip_below_bytes: Zip directories of many small files below this size; see add_directory.
 
     Returns:
         Dict: The response from the Zenodo API.
@@ -275,24 +864,114 @@ def add_thing(
         requests.exceptions.HTTPError: If the API request fails.
     """
     logger.debug(f"Uploading {thing} to Zenodo")
-    if not Path(thing).exists() and not valid_url(thing):
+    if kind is None:
+        kind = path_kind(thing)
+    if kind is None:
         raise ValueError(f"Path does not exist or is not a valid URL: {thing}")
-    if valid_url(thing):
-        return add_url(bucket_url, thing, params, name)
-    if Path(thing).is_dir():
+    if kind == "url":
+        return add_url(bucket_url, thing, params, name, session=session)
+    if kind == "dir":
         if zip:
-            return add_zipped_directory(bucket_url, thing, params, name)
+            return add_zipped_directory(
+                bucket_url, thing, params, name, session=session
+            )
         else:
-            return add_directory(bucket_url, thing, params)
-    if Path(thing).is_file():
-        return add_file(bucket_url, thing, params, name)
+            return add_directory(
+                bucket_url,
+                thing,
+                params,
+                existing=existing,
+                session=session,
+                max_files=max_files,
+                zip_below_bytes=zip_below_bytes,
+            )
+    if kind == "file":
+        file_path = Path(thing)
+        uploaded = already_uploaded(file_path, name or file_path.name, existing)
+        if uploaded:
+            return uploaded
+        return add_file(bucket_url, file_path, params, name, session=session)
     raise ValueError(
         f"Do not know how to deposit {thing}. Must be a file, URL, or directory."
     )
 
 
+def _freeze(value: Any) -> Any:
+    """
+    Turn a metadata value into a hashable key that compares like the value.
+    """
+    if isinstance(value, dict):
+        return frozenset((key, _freeze(item)) for key, item in value.items())
+    if isinstance(value, list):
+        return tuple(_freeze(item) for item in value)
+    return value
+
+
+def add_things(
+    bucket_url: str,
+    paths: List[str],
+    params: Dict,
+    name: str = None,
+    zip: bool = False,
+    kinds: Dict[str, str] = None,
+    existing: Dict[str, Dict] = None,
+    session: requests.Session = None,
+    max_workers: int = 4,
+    max_files: int = MAX_FILES,
+    zip_below_bytes: int = 0,
+) -> List[Dict]:
+    """
+    Upload several files, URLs, or directories to the Zenodo deposition bucket at once.
+
+    Args:
+        bucket_url: The URL of the deposition bucket.
+        paths: Paths to files, URLs, or directories.
+        params: Parameters for the request, including access token.
+        name: The name to save the file as, defaults to the original name.
+        zip: If True, zip directories before uploading.
+        kinds: The result of path_kind for each path, if the caller already has them.
+        existing: Files already in the bucket, from bucket_files; matching files are skipped.
+        session: Session to send requests with; defaults to the shared pool.
+        max_workers: Number of paths to upload at the same time.
+        max_files: Most files in a directory to upload one by one; see add_directory.
+        zip_below_bytes: Zip directories of many small files below this size; see add_directory.
+
+    Returns:
+        List[Dict]: The responses from the Zenodo API, in the same order as the paths.
+
+    Raises:
+        ValueError: If a path is not a file, URL, or directory.
+        requests.exceptions.HTTPError: If the API request fails.
+    """
+    kinds = kinds or {}
+    with ThreadPoolExecutor(max_workers=max(1, min(len(paths), max_workers))) as executor:
+        uploads = [
+            executor.submit(
+                add_thing,
+                bucket_url,
+                path,
+                params,
+                name,
+                zip,
+                kind=kinds.get(path),
+                existing=existing,
+                session=session,
+                max_files=max_files,
+                zip_below_bytes=zip_below_bytes,
+            )
+            for path in paths
+        ]
+        return [future.result() for future in uploads]
+
+
+@_retry
 def add_metadata(
-    base_url: str, deposition_id: int, metadata: Dict, params: Dict
+    base_url: str,
+    deposition_id: int,
+    metadata: Dict,
+    params: Dict,
+    session: requests.Session = None,
+    deposition: Dict = None,
 ) -> Dict:
     """
     Add metadata to a Zenodo deposition, merging with existing metadata.
@@ -302,38 +981,55 @@ def add_metadata(
         deposition_id (int): The ID of the deposition.
         metadata (Dict): The metadata to add to the deposition.
         params (Dict): The parameters for the request, including the access token.
+        session (requests.Session): Session to send requests with; defaults to the shared pool.
+        deposition (Dict): The deposition as last returned by the API, if the caller
+            already has it; otherwise it is fetched to merge with.
 
     Returns:
         Dict: The response from the Zenodo API.
     """
+    session = session or _SESSION
     logger.info(f"Adding metadata to deposition {deposition_id}")
     logger.debug(f"New metadata: {metadata}")
-    existing_deposition = get_deposition(deposition_id, params=params, base_url=base_url)
-    existing_metadata = existing_deposition.get("metadata", {})
+    if deposition is None:
+        deposition = _get_deposition(
+            deposition_id, params=params, base_url=base_url, session=session
+        )
+    existing_metadata = deposition.get("metadata", {})
     merged_metadata = existing_metadata.copy()
     for key, value in metadata.items():
         if key in ["keywords", "creators", "contributors"]:
             existing_list = merged_metadata.get(key, [])
             new_list = value if isinstance(value, list) else [value]
-            merged_list = existing_list + [item for item in new_list if item not in existing_list]
+            seen = {_freeze(item) for item in existing_list}
+            merged_list = list(existing_list)
+            for item in new_list:
+                item_key = _freeze(item)
+                if item_key not in seen:
+                    seen.add(item_key)
+                    merged_list.append(item)
             merged_metadata[key] = merged_list
         else:
             merged_metadata[key] = value
     logger.debug(f"Merged metadata: {merged_metadata}")
-    headers = {"Content-Type": "application/json"}
-    data = {"metadata": merged_metadata}
-    response = requests.put(
+    response = session.put(
         f"{base_url}/deposit/depositions/{deposition_id}",
         params=params,
-        data=json.dumps(data),
-        headers=headers,
+        json={"metadata": merged_metadata},
     )
     response.raise_for_status()
-    logger.debug(f"Response: {response.status_code} {response.json()}")
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug(f"Response: {response.status_code} {response.json()}")
     return response.json()
 
 
-def publish_deposition(base_url: str, deposition_id: int, params: Dict) -> Dict:
+@_retry_post
+def publish_deposition(
+    base_url: str,
+    deposition_id: int,
+    params: Dict,
+    session: requests.Session = None,
+) -> Dict:
     """
     Publish a Zenodo deposition.
 
@@ -341,6 +1037,7 @@ def publish_deposition(base_url: str, deposition_id: int, params: Dict) -> Dict:
         base_url (str): The base URL for the Zenodo API.
         deposition_id (int): The ID of the deposition.
         params (Dict): The parameters for the request, including the access token.
+        session (requests.Session): Session to send requests with; defaults to the shared pool.
 
     Returns:
         Dict: The response from the Zenodo API.
@@ -348,7 +1045,8 @@ def publish_deposition(base_url: str, deposition_id: int, params: Dict) -> Dict:
     Raises:
         requests.exceptions.HTTPError: If the API request fails.
     """
-    response = requests.post(
+    session = session or _SESSION
+    response = session.post(
         f"{base_url}/deposit/depositions/{deposition_id}/actions/publish", params=params
     )
     response.raise_for_status()
@@ -363,10 +1061,18 @@ def upload(
     sandbox: bool = True,
     publish: bool = False,
     zip: bool = False,
+    deposition_id: int = None,
+    session: requests.Session = None,
+    max_workers: int = 4,
+    max_files: int = MAX_FILES,
+    zip_below_bytes: int = 0,
 ) -> Dict:
     """
     Upload files to Zenodo with the given metadata.
 
+    Pass the ID of an existing draft deposition to resume an interrupted upload;
+    files already in its bucket with the same name and content are skipped.
+
     Args:
         paths: List of paths to files, URLs, or directories to upload.
         metadata (Dict): The metadata for the upload.
@@ -376,6 +1082,12 @@ def upload(
         sandbox (bool): If True, use the sandbox environment; otherwise, use production.
         publish (bool): If True, publish the deposition after uploading.
         zip (bool): If True, zip directories before uploading.
+        deposition_id (int): Upload into this existing draft instead of creating one.
+        session (requests.Session): Session to send requests with; defaults to the shared pool.
+        max_workers (int): Number of paths to upload at the same time.
+        max_files (int): Most files in a directory to upload one by one; see add_directory.
+        zip_below_bytes (int): Zip directories of many small files below this size;
+        see add_directory.
 
     Returns:
         Dict: The response from the Zenodo API.
@@ -386,29 +1098,75 @@ def upload(
     """
     if not paths:
         raise ValueError("At least one file must be specified for upload")
-    token = access_token(config, sandbox)
-    base_url = zenodo_url(sandbox)
-    params = {"access_token": token}
-
-    # Step 1: Create a new deposition
-    deposition = create_deposition(base_url, params)
-    deposition_id = deposition["id"]
-    bucket_url = deposition["links"]["bucket"]
-
-    # Step 2: Add metadata (in case file upload fails)
-    add_metadata(base_url, deposition_id, metadata, params)
-
-    # Step 3: Upload the files
-    for path in paths:
-        add_thing(bucket_url, path, params, name, zip)
-    
+    # Classify every path once, and fail before creating a deposition
+    kinds = {path: path_kind(path) for path in paths}
+    for path, kind in kinds.items():
+        if kind is None:
+            raise ValueError(f"Path does not exist or is not a valid URL: {path}")
+    client = make_client(config, sandbox)
+    base_url = client.base_url
+    params = client.params
+
+    # Step 1: Create a new deposition, or pick up an existing draft
+    if deposition_id:
+        deposition = get_deposition(
+            deposition_id, base_url=base_url, params=params, session=session
+        )
+        bucket_url = deposition["links"]["bucket"]
+        existing = bucket_files(bucket_url, params, session=session)
+    else:
+        # A new deposition is created with its metadata in the same request
+        deposition = create_deposition(base_url, params, session=session, metadata=metadata)
+        deposition_id = deposition["id"]
+        bucket_url = deposition["links"]["bucket"]
+        existing = None
+
+    # Steps 2 and 3: Add metadata to an existing draft, and upload the files.
+    # A new deposition already has its metadata, so only the upload runs
+    upload_paths = functools.partial(
+        add_things,
+        bucket_url,
+        paths,
+        params,
+        name,
+        zip,
+        kinds=kinds,
+        existing=existing,
+        session=session,
+        max_workers=max_workers,
+        max_files=max_files,
+        zip_below_bytes=zip_below_bytes,
+    )
+    if existing is None:
+        upload_paths()
+    else:
+        # The metadata is independent of the files, so it is merged while the
+        # paths upload; it is still in place if a file upload fails
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            metadata_added = executor.submit(
+                add_metadata,
+                base_url,
+                deposition_id,
+                metadata,
+                params,
+                session=session,
+                deposition=deposition,
+            )
+            upload_paths()
+            metadata_added.result()
+
     # Step 4: Publish the deposition, possibly
     if publish:
-        return publish_deposition(base_url, deposition_id, params)
+        return publish_deposition(base_url, deposition_id, params, session=session)
     return deposition
 
+@_retry
 def update_metadata(
-        base_url: str, deposition_id: int, metadata: Dict, params: Dict
+    base_url: str,
+    deposition_id: int,
+    metadata: Dict,
+    params: Dict,
+    session: requests.Session = None,
 ) -> Dict:
     """
     Update metadata of the Zenodo deposition.
@@ -418,6 +1176,7 @@ def update_metadata(
         deposition_id (int): The ID of the deposition.
         metadata (Dict): The metadata to update in the deposition.
         params (Dict): The parameters for the request, including the access token.
+        session (requests.Session): Session to send requests with; defaults to the shared pool.
 
     Returns:
         Dict: The updated deposition details.
@@ -425,19 +1184,25 @@ def update_metadata(
     Raises:
         requests.exceptions.HTTPError: If the API request fails.
     """
+    session = session or _SESSION
     logger.info(f"Updating metadata for deposition {deposition_id}")
-    headers = {"Content-Type": "application/json"}
-    response = requests.put(
+    response = session.put(
         f"{base_url}/deposit/depositions/{deposition_id}",
         params=params,
         json={"metadata": metadata},
-        headers=headers,
     )
-    logger.debug(f"Response: {response.status_code} {response.json()}")
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug(f"Response: {response.status_code} {response.json()}")
     response.raise_for_status()
     return response.json()
 
-def delete_deposition(base_url: str, deposition_id: int, params: Dict) -> Dict:
+@_retry
+def delete_deposition(
+    base_url: str,
+    deposition_id: int,
+    params: Dict,
+    session: requests.Session = None,
+) -> Dict:
     """
     Delete the Zenodo deposition. Note: published depositions cannot be deleted.
 
@@ -445,6 +1210,7 @@ def delete_deposition(base_url: str, deposition_id: int, params: Dict) -> Dict:
         base_url (str): The base URL for the Zenodo API.
         deposition_id (int): The ID of the deposition.
         params (Dict): The parameters for the request, including the access token.
+        session (requests.Session): Session to send requests with; defaults to the shared pool.
 
     Returns:
         Dict: Empty dict on success (204), or the API response on error.
@@ -452,7 +1218,8 @@ def delete_deposition(base_url: str, deposition_id: int, params: Dict) -> Dict:
     Raises:
         requests.exceptions.HTTPError: If the API request fails.
     """
-    response = requests.delete(
+    session = session or _SESSION
+    response = session.delete(
         f"{base_url}/deposit/depositions/{deposition_id}", params=params
     )
     response.raise_for_status()
@@ -461,7 +1228,15 @@ def delete_deposition(base_url: str, deposition_id: int, params: Dict) -> Dict:
     return response.json()
 
 
-def get_deposition(deposition_id: int, config: Dict = None, sandbox: bool = True, base_url: str = None, params: Dict = None) -> Dict:
+@_retry
+def get_deposition(
+    deposition_id: int,
+    config: Dict = None,
+    sandbox: bool = True,
+    base_url: str = None,
+    params: Dict = None,
+    session: requests.Session = None,
+) -> Dict:
     """
     Get details of a Zenodo deposition.
 
@@ -471,6 +1246,7 @@ def get_deposition(deposition_id: int, config: Dict = None, sandbox: bool = True
         sandbox: If True, use the sandbox environment; otherwise, use production.
         base_url: The base URL for the Zenodo API (optional).
         params: Parameters including access token (optional).
+        session: Session to send requests with; defaults to the shared pool.
 
     Returns:
         Dict: The response from the Zenodo API.
@@ -479,6 +1255,24 @@ def get_deposition(deposition_id: int, config: Dict = None, sandbox: bool = True
         ValueError: If the access token is missing.
         requests.exceptions.HTTPError: If the API request fails.
     """
+    return _get_deposition(deposition_id, config, sandbox, base_url, params, session)
+
+
+def _get_deposition(
+    deposition_id: int,
+    config: Dict = None,
+    sandbox: bool = True,
+    base_url: str = None,
+    params: Dict = None,
+    session: requests.Session = None,
+) -> Dict:
+    """
+    Get details of a Zenodo deposition without retrying; see get_deposition.
+
+    Functions that already retry as a whole call this, so a failed fetch is not
+    retried by two nested loops.
+    """
+    session = session or _SESSION
     if not base_url:
         base_url = zenodo_url(sandbox)
     if config:
@@ -493,14 +1287,24 @@ def get_deposition(deposition_id: int, config: Dict = None, sandbox: bool = True
     elif params.get("access_token") != token:
         params = params.copy()
         params["access_token"] = token
-    response = requests.get(
+    response = session.get(
         f"{base_url}/deposit/depositions/{deposition_id}", params=params
     )
     response.raise_for_status()
     return response.json()
 
 def create_new_version(
-    base_url: str, deposition_id: int, params: Dict[str, str], config: Dict[str, str], sandbox: bool = True, files_to_add: List[str] = None, zip: bool = False
+    base_url: str,
+    deposition_id: int,
+    params: Dict[str, str],
+    config: Dict[str, str],
+    sandbox: bool = True,
+    files_to_add: List[str] = None,
+    zip: bool = False,
+    session: requests.Session = None,
+    max_workers: int = 4,
+    max_files: int = MAX_FILES,
+    zip_below_bytes: int = 0,
 ) -> Dict[str, Any]:
     """
     Create a new version of an existing Zenodo deposition, adding new files.
@@ -513,20 +1317,31 @@ def create_new_version(
         sandbox: If True, use the sandbox environment; otherwise, use production.
         files_to_add: List of new file paths to upload to the new version.
         zip: If True, zip directories before uploading.
+        session: Session to send requests with; defaults to the shared pool.
+        max_workers: Number of files to upload at the same time.
+        max_files: Most files in a directory to upload one by one; see add_directory.
+        zip_below_bytes: Zip directories of many small files below this size; see add_directory.
 
     Returns:
         Dict[str, Any]: The new version deposition details.
 
     Raises:
         requests.exceptions.HTTPError: If the API request fails.
-        ValueError: If no files are provided when required.
+        ValueError: If a file to add does not exist and is not a valid URL.
     """
+    session = session or _SESSION
+    # Classify every path once, and fail before creating the new version
+    kinds = {path: path_kind(path) for path in files_to_add or []}
+    for path, kind in kinds.items():
+        if kind is None:
+            raise ValueError(f"Path does not exist or is not a valid URL: {path}")
     logger.info(f"Creating new version for deposition {deposition_id}")
-    r = requests.post(
+    r = session.post(
         f"{base_url}/deposit/depositions/{deposition_id}/actions/newversion",
         params=params,
     )
-    logger.debug(f"Response: {r.status_code} {r.json()}")
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug(f"Response: {r.status_code} {r.json()}")
     try:
         r.raise_for_status()
     except requests.exceptions.HTTPError:
@@ -535,13 +1350,35 @@ def create_new_version(
     new_version_data = r.json()
     new_deposition_id = new_version_data["links"]["latest_draft"].split("/")[-1]
     logger.info(f"New version created with ID: {new_deposition_id}")
-    new_deposition = get_deposition(int(new_deposition_id), config, sandbox)
+    new_deposition = get_deposition(
+        int(new_deposition_id), config, sandbox, session=session
+    )
     bucket_url = new_deposition["links"]["bucket"]
     if files_to_add:
-        for path in files_to_add:
-            add_thing(bucket_url, path, params, zip=zip)
+        # Files carried over from the previous version are not uploaded again
+        existing = bucket_files(bucket_url, params, session=session)
+        add_things(
+            bucket_url,
+            files_to_add,
+            params,
+            zip=zip,
+            kinds=kinds,
+            existing=existing,
+            session=session,
+            max_workers=max_workers,
+            max_files=max_files,
+            zip_below_bytes=zip_below_bytes,
+        )
     return new_version_data
 
+
+# Search options
+
+ACCEPTABLE_STATUSES = frozenset({"draft", "published", "all"})
+ACCEPTABLE_SORTS = frozenset({"bestmatch", "mostrecent", "-bestmatch", "-mostrecent"})
+
+
+@_retry
 def search(
     query: str,
     size: int = 25,
@@ -550,6 +1387,7 @@ def search(
     page: int = 1,
     config: Dict = None,
     sandbox: bool = True,
+    session: requests.Session = None,
 ) -> Dict:
     """
     Search for depositions on Zenodo.
@@ -562,6 +1400,7 @@ def search(
         status: Filter by deposition status (e.g., 'draft', 'published', 'all').
         sort: Sort order (e.g., 'bestmatch', 'mostrecent').
         page: Page number for pagination.
+        session (requests.Session): Session to send requests with; defaults to the shared pool.
 
     Returns:
         Dict: The response from the Zenodo API.
@@ -570,28 +1409,28 @@ def search(
         ValueError: If the access token is missing or invalid status/sort values are provided.
         requests.exceptions.HTTPError: If the API request fails.
     """
-    base_url = zenodo_url(sandbox)
-    token = access_token(config, sandbox)
-    params = {"access_token": token, "q": query}
+    session = session or _SESSION
+    client = make_client(config, sandbox)
+    params = {**client.params, "q": query}
     if size:
         params["size"] = size
     if status:
-        acceptable_statuses = ["draft", "published", "all"]
-        if status not in acceptable_statuses:
+        if status not in ACCEPTABLE_STATUSES:
             raise ValueError(
-                "Invalid status value. Must be one of: " + ", ".join(acceptable_statuses)
+                "Invalid status value. Must be one of: "
+                + ", ".join(sorted(ACCEPTABLE_STATUSES))
             )
-        if status in ["draft", "published"]:
+        if status != "all":
             params["status"] = status
     if sort:
-        acceptable_sorts = ["bestmatch", "mostrecent", "-bestmatch", "-mostrecent"]
-        if sort not in acceptable_sorts:
+        if sort not in ACCEPTABLE_SORTS:
             raise ValueError(
-                "Invalid sort value. Must be one of: " + ", ".join(acceptable_sorts)
+                "Invalid sort value. Must be one of: "
+                + ", ".join(sorted(ACCEPTABLE_SORTS))
             )
         params["sort"] = sort
     if page:
         params["page"] = page
-    response = requests.get(f"{base_url}/records", params=params)
+    response = session.get(f"{client.base_url}/records", params=params)
     response.raise_for_status()
     return response.json()
\ No newline at end of file
@@ -1,73 +1,210 @@
+import functools
 import logging
 import click
 import json
-import requests
-import zenodo_deposit.api
 import zenodo_deposit.config
-from zenodo_deposit.api import zenodo_url, access_token
-import os
+import re
+import sys
+from concurrent.futures import ThreadPoolExecutor
 import zenodo_deposit.metadata
-from rich.logging import RichHandler
 
 logger = logging.getLogger(__name__)
 
-def flatten(lists):
+def hide_access_token(token):
     """
-    Flatten a list of lists into a single list.
+    Hide all but the first 4 characters of an access token for logging.
 
     Args:
-        lists: A list of lists to flatten.
+        token: The access token to hide.
 
     Returns:
-        List: A flattened list.
+        str: The hidden token.
     """
-    def _flatten(lyst):
-        for el in lyst:
-            if isinstance(el, list):
-                yield from _flatten(el)
-            else:
-                yield el
+    return token[:4].ljust(len(token), "*") if token else str(None)
 
-    return list(_flatten(lists))
 
+def get_unique_dicts(dict_list):
+    """
+    Remove duplicate dictionaries from a list.
 
-def hide_access_token(token):
+    Args:
+        dict_list: List of dictionaries.
+
+    Returns:
+        List: List of unique dictionaries.
     """
-    Hide all but the first 4 characters of an access token for logging.
+    # Key on canonical JSON so dictionaries holding lists or dicts work too
+    seen = set()
+    unique_dicts = []
+    for d in dict_list:
+        key = json.dumps(d, sort_keys=True, default=str)
+        if key not in seen:
+            seen.add(key)
+            unique_dicts.append(d)
+    return unique_dicts
+
+
+def merge_keywords(existing, new):
+    """
+    Combine two lists of keywords, dropping duplicates but keeping their order.
 
     Args:
-        token: The access token to hide.
+        existing: Keywords already on the deposition.
+        new: Keywords to add.
 
     Returns:
-        str: The hidden token.
+        List: The existing keywords followed by the new ones not already present.
     """
-    return token[:4] + "*" * (len(token) - 4) if token else str(None)
+    return list(dict.fromkeys([*existing, *new]))
 
 
-def get_unique_dicts(dict_list):
+def http_error_message(error):
     """
-    Remove duplicate dictionaries from a list.
+    Get the message the Zenodo API gave for a failed request.
 
     Args:
-        dict_list: List of dictionaries.
+        error: The requests exception raised for the request.
 
     Returns:
-        List: List of unique dictionaries.
+        str: The API's message, or the error itself if the body has none.
     """
-    unique_dicts = {frozenset(d.items()): d for d in dict_list}.values()
-    # Convert the frozensets back to dictionaries
-    return list(unique_dicts)
+    # A failed Response is falsy, so compare against None explicitly; an empty
+    # body has nothing to parse
+    if error.response is None or not error.response.content:
+        return str(error)
+    try:
+        return error.response.json().get("message") or str(error)
+    except ValueError:
+        return str(error)
+
+
+def api_errors(message):
+    """
+    Report failed requests to the Zenodo API raised by a command as Click errors.
+
+    Args:
+        message: Prefix for the error, e.g. "Failed to publish".
+
+    Returns:
+        Callable: Decorator for a command function.
+    """
+
+    def decorator(command):
+        @functools.wraps(command)
+        def wrapper(*args, **kwargs):
+            import requests
+
+            try:
+                return command(*args, **kwargs)
+            except requests.exceptions.RequestException as e:
+                raise click.ClickException(f"{message}: {http_error_message(e)}")
+
+        return wrapper
+
+    return decorator
+
 
+def apply_overrides(metadata, keywords=None, **overrides):
+    """
+    Apply command line options on top of metadata read from a file.
+
+    Args:
+        metadata: The metadata dictionary to update in place.
+        keywords: Keywords to merge into the existing ones.
+        **overrides: Metadata fields to set; empty values are ignored.
+
+    Returns:
+        Dict: The updated metadata.
+    """
+    metadata.update({key: value for key, value in overrides.items() if value})
+    if keywords:
+        metadata["keywords"] = merge_keywords(metadata.get("keywords", []), keywords)
+    return metadata
+
+
+def print_json(results):
+    """
+    Write an API result to stdout as JSON.
+
+    Args:
+        results: The JSON-serializable result to print.
+    """
+    print(json.dumps(results))
+
+
+def parse_variables(variables):
+    """
+    Parse metadata substitution variables given as key=value or key:value.
+
+    Args:
+        variables: Iterable of variable strings.
+
+    Returns:
+        Dict: The variables, keyed by name.
+
+    Raises:
+        ValueError: If a variable has neither '=' nor ':'.
+    """
+    parsed = {}
+    for var in variables:
+        # Split on the first '=' if there is one, otherwise on the first ':'
+        key, sep, value = var.partition("=")
+        if not sep:
+            key, sep, value = var.partition(":")
+            if not sep:
+                raise ValueError(f"Invalid variable format: {var}")
+        logger.debug(f"Variable {key} = {value}")
+        parsed[key] = value
+    return parsed
+
+
+# Splits a comma-separated keyword list, trimming the space around commas
+_split_keywords = re.compile(r"\s*,\s*").split
+
+
+def split_keywords(values):
+    """
+    Split keyword options, each of which may hold a comma-separated list.
+
+    Args:
+        values: An iterable of keyword strings, such as ("rmp, epa", "air").
+
+    Returns:
+        List: The individual keywords, with blank entries dropped.
+    """
+    return [k for value in values for k in _split_keywords(value.strip()) if k]
 
 DEFAULT_USE_SANDBOX = True
 
-rich_handler = RichHandler(rich_tracebacks=True)
-rich_handler.console.stderr = True
-logging.basicConfig(
-    level=logging.INFO,
-    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
-    handlers=[rich_handler],
-)
+# Defaults for the directory zipping options; these match zenodo_deposit.api's,
+# which is not imported until a command runs
+DEFAULT_MAX_FILES = 100
+DEFAULT_ZIP_BELOW_BYTES = 0
+
+# Shared by every command's --type option
+_UPLOAD_TYPE_CHOICE = click.Choice(zenodo_deposit.metadata.upload_types)
+
+
+def _configure_logging():
+    """
+    Send log records to stderr, through rich when stderr is a terminal.
+
+    Called when a command runs rather than at import, so `zd --help` does not
+    pay for importing rich. Piped or CI output gets a plain handler and skips
+    rich altogether.
+    """
+    if sys.stderr.isatty():
+        from rich.logging import RichHandler
+
+        handler = RichHandler(rich_tracebacks=True)
+        handler.console.stderr = True
+    else:
+        handler = logging.StreamHandler(sys.stderr)
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+        handlers=[handler],
+    )
 
 
 @click.group(context_settings={"show_default": True})
@@ -106,6 +243,7 @@ def cli(ctx, sandbox, config_file, log_level):
         click.ClickException: If the configuration is invalid.
     """
     global logger
+    _configure_logging()
     if log_level:
         logging.getLogger().setLevel(log_level)
 
@@ -122,14 +260,21 @@ def cli(ctx, sandbox, config_file, log_level):
     except ValueError as e:
         raise click.ClickException(f"Invalid configuration: {str(e)}")
 
-    for key, value in config.items():
-        logger.debug(f"Setting {key} to {hide_access_token(value)}")
-        ctx.obj[key] = value
+    if logger.isEnabledFor(logging.DEBUG):
+        for key, value in config.items():
+            logger.debug(f"Setting {key} to {hide_access_token(value)}")
+    ctx.obj.update(config)
+
+    # Resolve the API URL and access token once for whichever command runs
+    from zenodo_deposit import api
+
+    ctx.obj["CLIENT"] = api.make_client(config, sandbox)
 
 
 @cli.command(help="Retrieve deposition details")
 @click.argument("deposition_id", type=int)
 @click.pass_context
+@api_errors("Failed to retrieve deposition")
 def retrieve(ctx, deposition_id):
     """
     Retrieve details of a Zenodo deposition by ID.
@@ -141,15 +286,14 @@ def retrieve(ctx, deposition_id):
     Raises:
         click.ClickException: If the access token is missing or the API request fails.
     """
+    from zenodo_deposit import api
+
     logger.info(f"Retrieving details for deposition: {deposition_id}")
-    try:
-        results = zenodo_deposit.api.get_deposition(
-            deposition_id=deposition_id, config=ctx.obj, sandbox=ctx.obj["SANDBOX"]
-        )
-        print(json.dumps(results))
-    except requests.exceptions.HTTPError as e:
-        error_msg = e.response.json().get("message", str(e)) if e.response else str(e)
-        raise click.ClickException(f"Failed to retrieve deposition: {error_msg}")
+    client = ctx.obj["CLIENT"]
+    results = api.get_deposition(
+        deposition_id, base_url=client.base_url, params=client.params
+    )
+    print_json(results)
 
 
 @cli.command(help="Deposit a file")
@@ -158,7 +302,7 @@ def retrieve(ctx, deposition_id):
     "--type",
     required=False,
     help="Upload type",
-    type=click.Choice(zenodo_deposit.metadata.upload_types),
+    type=_UPLOAD_TYPE_CHOICE,
 )
 @click.option(
     "--keywords",
@@ -187,15 +331,15 @@ def retrieve(ctx, deposition_id):
     help="Path to the metadata file",
     type=click.Path(),
 )
-@click.argument("file", type=click.Path(exists=True))
+@click.argument("file", type=click.Path(exists=True, resolve_path=True))
 @click.pass_context
-def deposit(ctx, title, type, keywords, name, affiliation, metadata):
+def deposit(ctx, title, type, keywords, name, affiliation, metadata, file):
     """
     Deposit a file to a new Zenodo deposition with metadata.
 
     Args:
         ctx: Click context object containing configuration.
-        file: The path to the file to upload.
+        file: The absolute path to the file to upload.
         title: Title of the deposition.
         type: Upload type (e.g., dataset, publication).
         keywords: Keyword(s) for the deposition.
@@ -206,13 +350,12 @@ def deposit(ctx, title, type, keywords, name, affiliation, metadata):
     Raises:
         click.ClickException: If the file is invalid or the API request fails.
     """
-    path = os.path.abspath(file) # noqa: F821
     ctx.obj["title"] = title
     ctx.obj["upload_type"] = type
-    ctx.obj["keywords"] = [x.strip() for x in keywords.split(",") if x.strip()]
+    ctx.obj["keywords"] = split_keywords([keywords])
     ctx.obj["name"] = name
     ctx.obj["affiliation"] = affiliation
-    logger.info(f"Depositing file: {path}")
+    logger.info(f"Depositing file: {file}")
     logger.debug(f"Title: {title}")
     logger.debug(f"Type: {type}")
     logger.debug(f"Keywords: {keywords}")
@@ -234,7 +377,7 @@ def deposit(ctx, title, type, keywords, name, affiliation, metadata):
     required=False,
     default="dataset",
     help="Upload type",
-    type=click.Choice(zenodo_deposit.metadata.upload_types),
+    type=_UPLOAD_TYPE_CHOICE,
 )
 @click.option(
     "--keywords",
@@ -250,6 +393,7 @@ def deposit(ctx, title, type, keywords, name, affiliation, metadata):
     type=click.Path(exists=True),
 )
 @click.pass_context
+@api_errors("Failed to create deposition")
 def create(ctx, title, description, variable, type, keywords, metadata):
     """
     Create a new Zenodo deposition without uploading a file, with optional metadata.
@@ -266,59 +410,36 @@ def create(ctx, title, description, variable, type, keywords, metadata):
     Raises:
         click.ClickException: If the token is missing, metadata is invalid, or the API request fails.
     """
+    from zenodo_deposit import api
+
     logger.info("Creating new deposition")
-    sandbox = ctx.obj["SANDBOX"]
-    base_url = zenodo_url(sandbox)
-    token = access_token(ctx.obj, sandbox)
-    if not token:
-        raise click.ClickException("Access token is missing")
-    params = {"access_token": token}
+    client = ctx.obj["CLIENT"]
+    base_url, params = client.base_url, client.params
     ctx.obj["title"] = title
     ctx.obj["description"] = description
     ctx.obj["upload_type"] = type
-    ctx.obj["keywords"] = [x.strip() for x in keywords]
+    keywords = split_keywords(keywords)
+    ctx.obj["keywords"] = keywords
     try:
-        for var in variable:
-            # Try splitting on '=' first, then ':'
-            if '=' in var:
-                key, value = var.split("=", 1)
-            elif ':' in var:
-                key, value = var.split(":", 1)
-            else:
-                raise ValueError(f"Invalid variable format: {var}")
-            logger.debug(f"Variable {key} = {value}")
-            ctx.obj[key] = value
+        ctx.obj.update(parse_variables(variable))
     except ValueError as e:
         raise click.ClickException(f"Invalid variable format, expected 'key=value' or 'key:val': {str(e)}")
     metadata_object = {}
     if metadata:
         metadata_object = zenodo_deposit.metadata.metadata_from_toml(metadata, ctx.obj)
-    if title:
-        metadata_object["title"] = title
-    if description:
-        metadata_object["description"] = description
-    if type:
-        metadata_object["upload_type"] = type
-    if keywords:
-        current_keywords = metadata_object.get("keywords", [])
-        metadata_object["keywords"] = list(set(current_keywords + list(keywords)))
+    apply_overrides(metadata_object, title=title, description=description, upload_type=type, keywords=keywords)
     if not metadata_object.get("title"):
         raise click.ClickException("Metadata must include title")
     if not metadata_object.get("creators"):
         raise click.ClickException("Metadata must include creators")
-    try:
-        results = zenodo_deposit.api.create_deposition(base_url, params)
-        if metadata_object:
-            results = zenodo_deposit.api.add_metadata(base_url, results["id"], metadata_object, params)
-        logger.info(f"Deposition created with ID: {results['id']}")
-        print(json.dumps(results))
-    except requests.exceptions.HTTPError as e:
-        error_msg = e.response.json().get("message", str(e)) if e.response else str(e)
-        raise click.ClickException(f"Failed to create deposition: {error_msg}")
+    results = api.create_deposition(base_url, params, metadata=metadata_object)
+    logger.info(f"Deposition created with ID: {results['id']}")
+    print_json(results)
 
 @cli.command(help="Publish an existing deposition")
 @click.argument("deposition_id", type=int)
 @click.pass_context
+@api_errors("Failed to publish")
 def publish(ctx, deposition_id):
     """
     Publish a Zenodo deposition by ID.
@@ -330,23 +451,19 @@ def publish(ctx, deposition_id):
     Raises:
         click.ClickException: If the token is missing or the API request fails.
     """
+    from zenodo_deposit import api
+
     logger.info(f"Publishing deposition: {deposition_id}")
-    base_url = zenodo_url(ctx.obj["SANDBOX"])
-    token = access_token(ctx.obj, ctx.obj["SANDBOX"])
-    if not token:
-        raise click.ClickException("Access token is missing")
-    params = {"access_token": token}
-    try:
-        results = zenodo_deposit.api.publish_deposition(base_url, deposition_id, params)
-        logger.info(f"Deposition published with ID: {deposition_id}")
-        print(json.dumps(results))
-    except requests.exceptions.HTTPError as e:
-        error_msg = e.response.json().get("message", str(e)) if e.response else str(e)
-        raise click.ClickException(f"Failed to publish: {error_msg}")
+    client = ctx.obj["CLIENT"]
+    base_url, params = client.base_url, client.params
+    results = api.publish_deposition(base_url, deposition_id, params)
+    logger.info(f"Deposition published with ID: {deposition_id}")
+    print_json(results)
 
 @cli.command(help="Delete a draft deposition")
 @click.argument("deposition_id", type=int)
 @click.pass_context
+@api_errors("Failed to delete")
 def delete(ctx, deposition_id):
     """
     Delete a Zenodo draft deposition by ID.
@@ -358,19 +475,14 @@ def delete(ctx, deposition_id):
     Raises:
         click.ClickException: If the token is missing or the API request fails.
     """
+    from zenodo_deposit import api
+
     logger.info(f"Deleting deposition: {deposition_id}")
-    base_url = zenodo_url(ctx.obj["SANDBOX"])
-    token = access_token(ctx.obj, ctx.obj["SANDBOX"])
-    if not token:
-        raise click.ClickException("Token missing")
-    params = {"access_token": token}
-    try:
-        results = zenodo_deposit.api.delete_deposition(base_url, deposition_id, params)
-        logger.info(f"Successfully deleted deposition with ID: {deposition_id}")
-        print(json.dumps(results))
-    except requests.exceptions.HTTPError as e:
-        error_msg = e.response.json().get("message", str(e)) if e.response else str(e)
-        raise click.ClickException(f"Failed to delete: {error_msg}")
+    client = ctx.obj["CLIENT"]
+    base_url, params = client.base_url, client.params
+    results = api.delete_deposition(base_url, deposition_id, params)
+    logger.info(f"Successfully deleted deposition with ID: {deposition_id}")
+    print_json(results)
 
 @cli.command("update_metadata", help="Update metadata for an existing deposition")
 @click.argument("deposition_id", type=int)
@@ -382,6 +494,7 @@ def delete(ctx, deposition_id):
     type=click.Path(exists=True),
 )
 @click.pass_context
+@api_errors("Failed to update metadata")
 def update_metadata(ctx, deposition_id, metadata):
     """
     Update metadata for a Zenodo deposition by ID, overwriting existing metadata.
@@ -394,24 +507,19 @@ def update_metadata(ctx, deposition_id, metadata):
     Raises:
         click.ClickException: If the token is missing, metadata is invalid, or the API request fails.
     """
+    from zenodo_deposit import api
+
     logger.info(f"Updating metadata for deposition: {deposition_id}")
-    base_url = zenodo_url(ctx.obj["SANDBOX"])
-    token = access_token(ctx.obj, ctx.obj["SANDBOX"])
-    if not token:
-        raise click.ClickException("Token missing")
-    params = {"access_token": token}
+    client = ctx.obj["CLIENT"]
+    base_url, params = client.base_url, client.params
     metadata_object = zenodo_deposit.metadata.metadata_from_toml(metadata, ctx.obj)
     if not metadata_object.get("title"):
         raise click.ClickException("Metadata must include title")
     if not metadata_object.get("creators"):
         raise click.ClickException("Metadata must include creators")
-    try:
-        results = zenodo_deposit.api.update_metadata(base_url, deposition_id, metadata_object, params)
-        logger.info(f"Metadata updated for deposition ID: {deposition_id}")
-        print(json.dumps(results))
-    except requests.exceptions.HTTPError as e:
-        error_msg = e.response.json().get("message", str(e)) if e.response else str(e)
-        raise click.ClickException(f"Failed to update metadata: {error_msg}")
+    results = api.update_metadata(base_url, deposition_id, metadata_object, params)
+    logger.info(f"Metadata updated for deposition ID: {deposition_id}")
+    print_json(results)
 
 @cli.command("add_metadata", help="Add metadata to an existing deposition, without overwriting existing metadata")
 @click.argument("deposition_id", type=int)
@@ -423,6 +531,7 @@ def update_metadata(ctx, deposition_id, metadata):
     type=click.Path(exists=True),
 )
 @click.pass_context
+@api_errors("Failed to add metadata")
 def add_metadata(ctx, deposition_id, metadata):
     """
     Add metadata to a Zenodo deposition by ID, merging with existing metadata.
@@ -435,24 +544,19 @@ def add_metadata(ctx, deposition_id, metadata):
     Raises:
         click.ClickException: If the token is missing, metadata is invalid, or the API request fails.
     """
+    from zenodo_deposit import api
+
     logger.info(f"Adding metadata to deposition {deposition_id}")
-    base_url = zenodo_url(ctx.obj["SANDBOX"])
-    token = access_token(ctx.obj, ctx.obj["SANDBOX"])
-    if not token:
-        raise click.ClickException("Access token missing")
-    params = {"access_token": token}
+    client = ctx.obj["CLIENT"]
+    base_url, params = client.base_url, client.params
     metadata_object = zenodo_deposit.metadata.metadata_from_toml(metadata, ctx.obj)
     if not metadata_object.get("title"):
         raise click.ClickException("Metadata must include title")
     if not metadata_object.get("creators"):
         raise click.ClickException("Metadata must include creators")
-    try:
-        results = zenodo_deposit.api.add_metadata(base_url, deposition_id, metadata_object, params)
-        logger.info(f"Metadata added to deposition ID: {deposition_id}")
-        print(json.dumps(results))
-    except requests.exceptions.HTTPError as e:
-        error_msg = e.response.json().get("message", str(e)) if e.response else str(e)
-        raise click.ClickException(f"Failed to add metadata: {error_msg}")
+    results = api.add_metadata(base_url, deposition_id, metadata_object, params)
+    logger.info(f"Metadata added to deposition ID: {deposition_id}")
+    print_json(results)
 
 @cli.command(help="Upload one or more files, creating a new deposition with metadata")
 @click.option("--title", required=False, help="Title of the deposition")
@@ -468,7 +572,7 @@ def add_metadata(ctx, deposition_id, metadata):
     required=False,
     default="dataset",
     help="Upload type",
-    type=click.Choice(zenodo_deposit.metadata.upload_types),
+    type=_UPLOAD_TYPE_CHOICE,
 )
 @click.option(
     "--keywords",
@@ -495,9 +599,28 @@ def add_metadata(ctx, deposition_id, metadata):
     is_flag=True,
     help="Zip directories before uploading",
 )
-@click.argument("files", type=click.Path(exists=True, file_okay=True, dir_okay=True), nargs=-1)
+@click.option(
+    "--max-files",
+    default=DEFAULT_MAX_FILES,
+    type=click.IntRange(min=1),
+    help="Zip directories holding more files than this",
+)
+@click.option(
+    "--zip-below",
+    default=DEFAULT_ZIP_BELOW_BYTES,
+    type=click.IntRange(min=0),
+    help="Zip directories of many small files adding up to fewer bytes than this, except when resuming; 0 to disable",
+)
+@click.option(
+    "--deposition-id",
+    default=None,
+    type=int,
+    help="Resume uploading into an existing draft deposition, skipping files already there",
+)
+@click.argument("files", type=click.Path(), nargs=-1)
 @click.pass_context
-def upload(ctx, title, description, variable, type, keywords, metadata, publish, zip, files):
+@api_errors("Failed to upload files")
+def upload(ctx, title, description, variable, type, keywords, metadata, publish, zip, max_files, zip_below, deposition_id, files):
     """
     Upload one or more files to a new Zenodo deposition with metadata.
 
@@ -512,71 +635,64 @@ def upload(ctx, title, description, variable, type, keywords, metadata, publish,
         metadata: Path to the metadata file.
         publish: Flag to publish after uploading.
         zip: Flag to zip directories before uploading.
+        max_files: Zip directories holding more files than this.
+        zip_below: Zip directories of many small files adding up to fewer bytes than this.
+        deposition_id: ID of an existing draft deposition to resume uploading into.
 
     Raises:
         click.ClickException: If no files are provided, metadata is invalid, or the API request fails.
     """
+    from zenodo_deposit import api
+
     if not files:
         raise click.ClickException("At least one file must be specified")
-    logger.debug(f"Uploading files with sandbox={ctx.obj['SANDBOX']} {ctx.obj}")
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug(f"Uploading files with sandbox={ctx.obj['SANDBOX']} {ctx.obj}")
     ctx.obj["title"] = title
     ctx.obj["description"] = description
     ctx.obj["upload_type"] = type
-    ctx.obj["keywords"] = [x.strip() for x in keywords]
+    keywords = split_keywords(keywords)
+    ctx.obj["keywords"] = keywords
     try:
-        for var in variable:
-            # Try splitting on '=' first, then ':'
-            if '=' in var:
-                key, value = var.split("=", 1)
-            elif ':' in var:
-                key, value = var.split(":", 1)
-            else:
-                raise ValueError(f"Invalid variable format: {var}")
-            logger.debug(f"Variable {key} = {value}")
-            ctx.obj[key] = value
+        ctx.obj.update(parse_variables(variable))
     except ValueError as e:
         raise click.ClickException(f"Invalid variable format, expected 'key=value' or 'key:val': {str(e)}")
-    token = access_token(ctx.obj, ctx.obj["SANDBOX"])
+    client = ctx.obj["CLIENT"]
     logger.info(
-        f"Uploading {files} to {zenodo_url(ctx.obj['SANDBOX'])} using token {hide_access_token(token)}"
+        f"Uploading {files} to {client.base_url} using token {hide_access_token(client.token)}"
     )
     logger.debug(f"Metadata: {title}")
     logger.debug(f"Type: {type}")
     logger.debug(f"Keywords: {keywords}")
     metadata_object = zenodo_deposit.metadata.metadata_from_toml(metadata, ctx.obj)
-    if title:
-        metadata_object["title"] = title
-    if description:
-        metadata_object["description"] = description
-    if type:
-        metadata_object["upload_type"] = type
-    if keywords:
-        current_keywords = metadata_object.get("keywords", [])
-        metadata_object["keywords"] = list(set(current_keywords + list(keywords)))
+    apply_overrides(metadata_object, title=title, description=description, upload_type=type, keywords=keywords)
     if not metadata_object.get("title"):
         raise click.ClickException("Metadata must include title")
     if not metadata_object.get("creators"):
         raise click.ClickException("Metadata must include creators")
     if not metadata_object.get("upload_type"):
         raise click.ClickException("Metadata must include upload_type")
-    logger.debug(f"Metadata object: {metadata_object}")
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug(f"Metadata object: {metadata_object}")
     try:
-        results = zenodo_deposit.api.upload(
+        results = api.upload(
             paths=files,
             metadata=metadata_object,
             config=ctx.obj,
             sandbox=ctx.obj["SANDBOX"],
             publish=publish,
             zip=zip,
+            deposition_id=deposition_id,
+            max_files=max_files,
+            zip_below_bytes=zip_below,
         )
-        if publish:
-            logger.info(f"Deposition published with ID: {results['id']}")
-        else:
-            logger.info(f"Deposition created with ID: {results['id']}")
-        print(json.dumps(results))
-    except requests.exceptions.HTTPError as e:
-        error_msg = e.response.json().get("message", str(e)) if e.response else str(e)
-        raise click.ClickException(f"Failed to upload files: {error_msg}")
+    except ValueError as e:
+        raise click.ClickException(str(e))
+    if publish:
+        logger.info(f"Deposition published with ID: {results['id']}")
+    else:
+        logger.info(f"Deposition created with ID: {results['id']}")
+    print_json(results)
 
 @cli.command("new_version", help="Create a new version of an existing deposition")
 @click.argument("deposition_id", type=int)
@@ -593,7 +709,7 @@ def upload(ctx, title, description, variable, type, keywords, metadata, publish,
     required=False,
     default="dataset",
     help="Upload type",
-    type=click.Choice(zenodo_deposit.metadata.upload_types),
+    type=_UPLOAD_TYPE_CHOICE,
 )
 @click.option(
     "--keywords",
@@ -618,9 +734,21 @@ def upload(ctx, title, description, variable, type, keywords, metadata, publish,
     default=False,
     help="Zip directories before uploading",
 )
-@click.argument("files", type=click.Path(exists=True, file_okay=True, dir_okay=True), nargs=-1)
+@click.option(
+    "--max-files",
+    default=DEFAULT_MAX_FILES,
+    type=click.IntRange(min=1),
+    help="Zip directories holding more files than this",
+)
+@click.option(
+    "--zip-below",
+    default=DEFAULT_ZIP_BELOW_BYTES,
+    type=click.IntRange(min=0),
+    help="Zip directories of many small files adding up to fewer bytes than this, except when resuming; 0 to disable",
+)
+@click.argument("files", type=click.Path(), nargs=-1)
 @click.pass_context
-def new_version(ctx, deposition_id, title, description, variable, type, keywords, metadata, publish, zip, files):
+def new_version(ctx, deposition_id, title, description, variable, type, keywords, metadata, publish, zip, max_files, zip_below, files):
     """
     Create a new version of an existing Zenodo deposition, uploading additional or updated files.
 
@@ -636,94 +764,96 @@ def new_version(ctx, deposition_id, title, description, variable, type, keywords
         metadata: Path to the metadata TOML file.
         publish: Flag to publish after uploading.
         zip: Flag to zip directories before uploading.
+        max_files: Zip directories holding more files than this.
+        zip_below: Zip directories of many small files adding up to fewer bytes than this.
 
     Raises:
         click.ClickException: If the token is missing, deposition_id is invalid, or the API request fails.
     """
+    import requests
+    from zenodo_deposit import api
+
     if not files:
         raise click.ClickException("At least one file must be specified for new version")
     logger.info(f"Creating new version for deposition: {deposition_id}")
-    base_url = zenodo_url(ctx.obj["SANDBOX"])
-    token = access_token(ctx.obj, ctx.obj["SANDBOX"])
-    if not token:
-        raise click.ClickException("Access token missing")
-    params = {"access_token": token}
+    client = ctx.obj["CLIENT"]
+    base_url, params = client.base_url, client.params
+    ctx.obj["title"] = title
+    ctx.obj["description"] = description
+    ctx.obj["upload_type"] = type
+    keywords = split_keywords(keywords)
+    ctx.obj["keywords"] = keywords
     try:
-        base_deposition = zenodo_deposit.api.get_deposition(deposition_id, ctx.obj, ctx.obj["SANDBOX"])
-        base_metadata = base_deposition.get("metadata", {})
-        logger.debug(f"Base deposition metadata: {base_metadata}")
-    except requests.exceptions.HTTPError as e:
-        error_msg = e.response.json().get("message", str(e)) if e.response else str(e)
-        raise click.ClickException(f"Failed to retrieve base deposition: {error_msg}")
+        ctx.obj.update(parse_variables(variable))
+    except ValueError as e:
+        raise click.ClickException(f"Invalid variable format, expected 'key=value' or 'key:val': {str(e)}")
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        # Read the metadata file while the base deposition is being fetched
+        new_metadata = None
+        if metadata:
+            new_metadata = executor.submit(
+                zenodo_deposit.metadata.metadata_from_toml, metadata, ctx.obj
+            )
+        try:
+            base_deposition = api.get_deposition(deposition_id, base_url=base_url, params=params)
+            base_metadata = base_deposition.get("metadata", {})
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(f"Base deposition metadata: {base_metadata}")
+        except requests.exceptions.RequestException as e:
+            error_msg = http_error_message(e)
+            raise click.ClickException(f"Failed to retrieve base deposition: {error_msg}")
     if not base_metadata.get("title"):
         raise click.ClickException("Base deposition must have title")
     if not base_metadata.get("creators"):
         raise click.ClickException("Base deposition must have creators")
     if not base_metadata.get("upload_type"):
         raise click.ClickException("Base deposition must have an upload type")
-    ctx.obj["title"] = title
-    ctx.obj["description"] = description
-    ctx.obj["upload_type"] = type
-    ctx.obj["keywords"] = [x.strip() for x in keywords]
-    try:
-        for var in variable:
-            # Try splitting on '=' first, then ':'
-            if '=' in var:
-                key, value = var.split("=", 1)
-            elif ':' in var:
-                key, value = var.split(":", 1)
-            else:
-                raise ValueError(f"Invalid variable format: {var}")
-            logger.debug(f"Variable {key} = {value}")
-            ctx.obj[key] = value
-    except ValueError as e:
-        raise click.ClickException(f"Invalid variable format, expected 'key=value' or 'key:val': {str(e)}")
     metadata_object = base_metadata.copy()
-    if metadata:
-        new_metadata = zenodo_deposit.metadata.metadata_from_toml(metadata, ctx.obj)
-        metadata_object.update(new_metadata)
-    if title:
-        metadata_object["title"] = title
-    if description:
-        metadata_object["description"] = description
-    if type:
-        metadata_object["upload_type"] = type
-    if keywords:
-        current_keywords = metadata_object.get("keywords", [])
-        metadata_object["keywords"] = list(set(current_keywords + list(keywords)))
+    if new_metadata:
+        metadata_object.update(new_metadata.result())
+    apply_overrides(metadata_object, title=title, description=description, upload_type=type, keywords=keywords)
     if not metadata_object.get("title"):
         raise click.ClickException("Title required")
     if not metadata_object.get("creators"):
         raise click.ClickException("Creators required")
     if not metadata_object.get("upload_type"):
         raise click.ClickException("Upload type required")
-    logger.debug(f"New version metadata: {metadata_object}")
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug(f"New version metadata: {metadata_object}")
     try:
-        new_version_data = zenodo_deposit.api.create_new_version(
-            base_url, deposition_id, params, ctx.obj, ctx.obj["SANDBOX"], files_to_add=files, zip=zip
+        new_version_data = api.create_new_version(
+            base_url,
+            deposition_id,
+            params,
+            ctx.obj,
+            ctx.obj["SANDBOX"],
+            files_to_add=files,
+            zip=zip,
+            max_files=max_files,
+            zip_below_bytes=zip_below,
         )
         new_deposition_id = new_version_data["links"]["latest_draft"].split("/")[-1]
-    except requests.exceptions.HTTPError as e:
-        error_msg = e.response.json().get("message", str(e)) if e.response else str(e)
+    except requests.exceptions.RequestException as e:
+        error_msg = http_error_message(e)
         raise click.ClickException(f"Failed to create new version: {error_msg}")
+    except ValueError as e:
+        raise click.ClickException(str(e))
     try:
-        zenodo_deposit.api.update_metadata(base_url, new_deposition_id, metadata_object, params)
-    except requests.exceptions.HTTPError as e:
-        error_msg = e.response.json().get("message", str(e)) if e.response else str(e)
+        # The updated draft comes back from the PUT, so it need not be fetched again
+        results = api.update_metadata(base_url, new_deposition_id, metadata_object, params)
+    except requests.exceptions.RequestException as e:
+        error_msg = http_error_message(e)
         raise click.ClickException(f"Failed to update metadata: {error_msg}")
     try:
         if publish:
-            results = zenodo_deposit.api.publish_deposition(base_url, new_deposition_id, params)
+            results = api.publish_deposition(base_url, new_deposition_id, params)
             logger.info(f"New version published with ID: {new_deposition_id}")
         else:
-            results = zenodo_deposit.api.get_deposition(
-                deposition_id=int(new_deposition_id), config=ctx.obj, sandbox=ctx.obj["SANDBOX"]
-            )
             logger.info(f"New version created as draft with ID: {new_deposition_id}")
-        print(json.dumps(results))
-    except requests.exceptions.HTTPError as e:
-        error_msg = e.response.json().get("message", str(e)) if e.response else str(e)
-        raise click.ClickException(f"Failed tofinalize operation: {error_msg}")
+        print_json(results)
+    except requests.exceptions.RequestException as e:
+        error_msg = http_error_message(e)
+        raise click.ClickException(f"Failed to finalize operation: {error_msg}")
 
 @cli.command(help="Add tags to an existing deposition")
 @click.argument("deposition_id", type=int)
@@ -735,6 +865,7 @@ def new_version(ctx, deposition_id, title, description, variable, type, keywords
     help="Keyword(s) to add to the deposition",
 )
 @click.pass_context
+@api_errors("Failed to add tags to deposition")
 def tag(ctx, deposition_id, keywords):
     """
     Add tags (keywords) to a Zenodo deposition by ID.
@@ -750,23 +881,18 @@ def tag(ctx, deposition_id, keywords):
     Raises:
         click.ClickException: If the access token is missing or the API request fails.
     """
+    from zenodo_deposit import api
+
     logger.info(f"Adding tags to deposition: {deposition_id}")
-    base_url = zenodo_url(ctx.obj["SANDBOX"])
-    token = access_token(ctx.obj, ctx.obj["SANDBOX"])
-    if not token:
-        raise click.ClickException("Access token is missing in the configuration")
-    params = {"access_token": token}
-    try:
-        deposition = zenodo_deposit.api.get_deposition(deposition_id, ctx.obj, ctx.obj["SANDBOX"])
-        metadata = deposition.get("metadata", {})
-        current_keywords = metadata.get("keywords", [])
-        metadata["keywords"] = list(set(current_keywords + list(keywords)))
-        results = zenodo_deposit.api.update_metadata(base_url, deposition_id, metadata, params)
-        logger.info(f"Tags added to deposition ID: {deposition_id}")
-        print(json.dumps(results))
-    except requests.exceptions.HTTPError as e:
-        error_msg = e.response.json().get("message", str(e)) if e.response else str(e)
-        raise click.ClickException(f"Failed to add tags to deposition: {error_msg}")
+    client = ctx.obj["CLIENT"]
+    base_url, params = client.base_url, client.params
+    deposition = api.get_deposition(deposition_id, base_url=base_url, params=params)
+    metadata = deposition.get("metadata", {})
+    current_keywords = metadata.get("keywords", [])
+    metadata["keywords"] = merge_keywords(current_keywords, split_keywords(keywords))
+    results = api.update_metadata(base_url, deposition_id, metadata, params)
+    logger.info(f"Tags added to deposition ID: {deposition_id}")
+    print_json(results)
 
 
 @cli.command(help="Search depositions based on a query string")
@@ -780,6 +906,7 @@ def tag(ctx, deposition_id, keywords):
     help="Filter by deposition status (e.g., draft, published, all)",
 )
 @click.pass_context
+@api_errors("Failed to search depositions")
 def search(ctx, query, size, page, sort, status):
     """
     Search depositions based on a query string.
@@ -795,9 +922,11 @@ def search(ctx, query, size, page, sort, status):
     Raises:
         click.ClickException: If the token is missing or the API request fails.
     """
+    from zenodo_deposit import api
+
     logger.info(f"Searching depositions with query: {query}")
     try:
-        results = zenodo_deposit.api.search(
+        results = api.search(
             query=query,
             size=size,
             page=page,
@@ -806,10 +935,9 @@ def search(ctx, query, size, page, sort, status):
             config=ctx.obj,
             sandbox=ctx.obj["SANDBOX"],
         )
-        print(json.dumps(results))
-    except (requests.exceptions.HTTPError, ValueError) as e:
-        error_msg = e.response.json().get("message", str(e)) if hasattr(e, 'response') and e.response else str(e)
-        raise click.ClickException(f"Failed to search depositions: {error_msg}")
+    except ValueError as e:
+        raise click.ClickException(f"Failed to search depositions: {str(e)}")
+    print_json(results)
 
 if __name__ == "__main__":
     cli()
\ No newline at end of file
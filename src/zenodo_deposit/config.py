@@ -1,6 +1,6 @@
 import tomllib as toml
 import os
-import re
+import string
 from functools import lru_cache
 from typing import Dict, Optional
 import logging
@@ -15,6 +15,14 @@ default_zenodo: Dict[str, str] = {
 
 settings_name = ".zenodo-deposit-settings.toml"
 
+# Where to look for settings when no file is given, in order
+_DEFAULT_CONFIG_PATHS = (settings_name, os.path.expanduser(f"~/{settings_name}"))
+
+# Zenodo tokens are alphanumeric, with underscores and hyphens; translating a
+# token with this table deletes those, leaving only the invalid characters
+_TOKEN_CHARS = string.ascii_letters + string.digits + "_-"
+_INVALID_TOKEN_CHARS = str.maketrans("", "", _TOKEN_CHARS)
+
 def first_file_that_exists(files):
     """
     Return the first file that exists from a list of files.
@@ -25,10 +33,58 @@ def first_file_that_exists(files):
     Returns:
         str: Path to the first existing file, or None if none exist.
     """
-    for file in files:
-        if os.path.exists(file):
-            return file
-    return None
+    return next((file for file in files if os.path.exists(file)), None)
+
+
+def _parse_toml(path: str) -> Dict:
+    """
+    Read a TOML file in one go and parse it.
+
+    Args:
+        path: Path to the TOML file.
+
+    Returns:
+        Dict: The parsed TOML.
+    """
+    with open(path, "rb") as f:
+        data = f.read()
+    return toml.loads(data.decode("utf-8"))
+
+
+@lru_cache(maxsize=8)
+def _load_toml(path: str, mtime_ns: int) -> Dict:
+    """
+    Parse a TOML file. The modification time is part of the cache key, so an
+    edited file is parsed again.
+
+    Args:
+        path: Resolved path to the TOML file.
+        mtime_ns: Modification time of the file, in nanoseconds.
+
+    Returns:
+        Dict: The parsed TOML.
+    """
+    return _parse_toml(path)
+
+
+def _read_toml(file: str) -> Dict:
+    """
+    Parse a TOML file, reusing the result while the file is unchanged.
+
+    Args:
+        file: Path to the TOML file.
+
+    Returns:
+        Dict: The parsed TOML, which the caller may modify.
+    """
+    try:
+        path = os.path.realpath(file)
+        mtime_ns = os.stat(path).st_mtime_ns
+    except OSError:
+        # Cannot stat it, so read it without caching
+        return _parse_toml(file)
+    return copy.deepcopy(_load_toml(path, mtime_ns))
+
 
 def read_config_file(file: Optional[str] = None) -> Dict[str, Dict[str, str]]:
     """
@@ -45,37 +101,21 @@ def read_config_file(file: Optional[str] = None) -> Dict[str, Dict[str, str]]:
         ValueError: If the config file is invalid or cannot be read.
     """
     logger.debug(f"Attempting to read config file: {file if file else 'default locations'}")
-    if file:
-        logger.info(f"Reading config file: {file}")
-        try:
-            with open(file, "rb") as f:
-                config = toml.load(f)
-                logger.debug(f"Loaded config: {config}")
-                return config
-        except Exception as e:
-            logger.error(f"Failed to load config file {file}: {e}")
-            raise ValueError(f"Invalid config file: {e}")
-    else:
-        first_config = first_file_that_exists(
-            [
-                settings_name,
-                os.path.expanduser(f"~/{settings_name}"),
-            ]
-        )
-        if first_config:
-            logger.info(f"Reading config file: {first_config}")
-            try:
-                with open(first_config, "rb") as f:
-                    config = toml.load(f)
-                    logger.debug(f"Loaded config: {config}")
-                    return config
-            except Exception as e:
-                logger.error(f"Failed to load config file {first_config}: {e}")
-                raise ValueError(f"Invalid config file: {e}")
-    logger.debug("No config file found, using default_zenodo")
-    return {"zenodo": copy.deepcopy(default_zenodo)}
+    if not file:
+        file = first_file_that_exists(_DEFAULT_CONFIG_PATHS)
+        if not file:
+            logger.debug("No config file found, using default_zenodo")
+            return {"zenodo": dict(default_zenodo)}
+    logger.info(f"Reading config file: {file}")
+    try:
+        config = _read_toml(file)
+    except Exception as e:
+        logger.error(f"Failed to load config file {file}: {e}")
+        raise ValueError(f"Invalid config file: {e}")
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug(f"Loaded config: {config}")
+    return config
 
-@lru_cache(maxsize=32)
 def config_section(
     config_file: Optional[str] = None,
     section: str = "zenodo",
@@ -93,19 +133,60 @@ def config_section(
     Raises:
         ValueError: If the section is not found in the configuration.
     """
+    # Resolve the path so every spelling of the same file shares a cache entry,
+    # and key on its modification time so an edited file is read again
+    if not config_file:
+        config_file = first_file_that_exists(_DEFAULT_CONFIG_PATHS)
+    mtime_ns = None
+    if config_file:
+        config_file = os.path.realpath(os.path.expanduser(config_file))
+        try:
+            mtime_ns = os.stat(config_file).st_mtime_ns
+        except OSError:
+            # Leave it to read_config_file to report the problem
+            pass
+    result = _config_section(config_file, section, mtime_ns)
+    if result is None:
+        raise ValueError(f"Section {section} not found in the configuration file")
+    return result
+
+
+@lru_cache(maxsize=32)
+def _config_section(
+    config_file: Optional[str], section: str, mtime_ns: Optional[int] = None
+) -> Optional[Dict[str, str]]:
+    """
+    Read a section of a configuration file; see config_section.
+
+    Args:
+        config_file: Resolved path to the configuration file, or None for the defaults.
+        section: Section of the config file to read.
+        mtime_ns: Modification time of the file, in nanoseconds; only part of the cache key.
+
+    Returns:
+        Optional[Dict[str, str]]: Configuration section dictionary, or None if the
+        section is missing, so callers can probe for optional sections.
+
+    Raises:
+        ValueError: If the config file is invalid or cannot be read.
+    """
     logger.debug(f"Reading section '{section}' from config file: {config_file}")
     config = read_config_file(config_file)
     config_section = config.get(section)
     if not config_section:
-        raise ValueError(f"Section {section} not found in the configuration file")
-    config_section = copy.deepcopy(config_section)  # Prevent modifying original
-    logger.debug(f"Config section before env update: {config_section}")
-    for key in config_section.keys():
-        if key in os.environ:
-            config_section[key] = os.environ[key]
-    logger.debug(f"Config section after env update: {config_section}")
+        return None
+    debug = logger.isEnabledFor(logging.DEBUG)
+    if debug:
+        logger.debug(f"Config section before env update: {config_section}")
+    # Copy the section, letting environment variables override its values
+    config_section = {key: os.environ.get(key, value) for key, value in config_section.items()}
+    if debug:
+        logger.debug(f"Config section after env update: {config_section}")
     return config_section
 
+
+config_section.cache_clear = _config_section.cache_clear
+
 def zenodo_config(config_file: Optional[str] = None) -> Dict[str, str]:
     """
     Read the Zenodo configuration from the file (access keys).
@@ -134,34 +215,61 @@ def validate_zenodo_config(config: Dict[str, str], use_sandbox: bool = False) ->
     Raises:
         ValueError: If the required token is missing, invalid, or doesn't match expected format.
     """
-    logger.debug(f"Config module path: {__file__}")
-    logger.debug(f"Full config before validation: {config}")
-    logger.debug(f"Default zenodo config: {default_zenodo}")
     token_key = "ZENODO_SANDBOX_ACCESS_TOKEN" if use_sandbox else "ZENODO_ACCESS_TOKEN"
     token = config.get(token_key)
-    logger.debug(f"{token_key} raw: {repr(token)}")
-    logger.debug(f"{token_key} length: {len(token) if token else 0}")
-    logger.debug(f"{token_key} stripped: {token.strip() if token else ''}")
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug(f"Config module path: {__file__}")
+        logger.debug(f"Full config before validation: {config}")
+        logger.debug(f"Default zenodo config: {default_zenodo}")
+        logger.debug(f"{token_key} raw: {repr(token)}")
+        logger.debug(f"{token_key} length: {len(token) if token else 0}")
+    _check_token_format(token or "", use_sandbox)
+    logger.debug(f"Config validation passed for {token_key}")
+    return True
+
+
+@lru_cache(maxsize=16)
+def _check_token_format(token: str, use_sandbox: bool) -> bool:
+    """
+    Check the format of an access token. Only passing tokens are cached, as
+    lru_cache does not keep results for calls that raise.
+
+    Args:
+        token: The access token, possibly surrounded by whitespace.
+        use_sandbox: Whether this is the sandbox or production token.
+
+    Returns:
+        bool: True if the token looks valid.
 
-    if not token or token.strip() == "":
+    Raises:
+        ValueError: If the token is empty, the default, too short, or has invalid characters.
+    """
+    token_key = "ZENODO_SANDBOX_ACCESS_TOKEN" if use_sandbox else "ZENODO_ACCESS_TOKEN"
+    tokens_url = (
+        "https://sandbox.zenodo.org/account/settings/tokens/"
+        if use_sandbox
+        else "https://zenodo.org/account/settings/tokens/"
+    )
+    stripped = token.strip()
+    length = len(stripped)
+    if not length:
         raise ValueError(
             f"{token_key} is not set or empty. Set it in the config file or environment variable. "
-            f"Generate a new token at {'https://sandbox.zenodo.org/account/settings/tokens/' if use_sandbox else 'https://zenodo.org/account/settings/tokens/'}"
+            f"Generate a new token at {tokens_url}"
         )
-    if token.strip() == default_zenodo[token_key]:
+    if stripped == default_zenodo[token_key]:
         raise ValueError(
             f"{token_key} is set to default value ('{default_zenodo[token_key]}'). "
-            f"Replace with a valid token from {'https://sandbox.zenodo.org/account/settings/tokens/' if use_sandbox else 'https://zenodo.org/account/settings/tokens/'}"
+            f"Replace with a valid token from {tokens_url}"
         )
-    if len(token.strip()) < 32:  # Zenodo tokens are typically long
+    if length < 32:  # Zenodo tokens are typically long
         raise ValueError(
-            f"{token_key} is too short (length: {len(token.strip())}). Expected a valid Zenodo token. "
-            f"Generate a new token at {'https://sandbox.zenodo.org/account/settings/tokens/' if use_sandbox else 'https://zenodo.org/account/settings/tokens/'}"
+            f"{token_key} is too short (length: {length}). Expected a valid Zenodo token. "
+            f"Generate a new token at {tokens_url}"
         )
-    if not re.match(r"^[a-zA-Z0-9_-]+$", token.strip()):
+    if stripped.translate(_INVALID_TOKEN_CHARS):
         raise ValueError(
             f"{token_key} contains invalid characters. Expected alphanumeric, underscore, or hyphen. "
-            f"Generate a new token at {'https://sandbox.zenodo.org/account/settings/tokens/' if use_sandbox else 'https://zenodo.org/account/settings/tokens/'}"
+            f"Generate a new token at {tokens_url}"
         )
-    logger.debug(f"Config validation passed for {token_key}")
-    return True
\ No newline at end of file
+    return True
@@ -1,6 +1,8 @@
 from string import Template
+from functools import lru_cache
 import tomllib as toml
 import logging
+import os
 
 logger = logging.getLogger(__name__)
 
@@ -12,13 +14,29 @@ def metadata(template: str, vars: dict) -> str:
     return Template(template).safe_substitute(vars)
 
 
+@lru_cache(maxsize=32)
+def _read_template(file: str, mtime_ns: int, size: int) -> str:
+    """
+    Read a template file; the modification time and size key the cache, so an
+    edited file is read again
+    """
+    with open(file, "r") as f:
+        return f.read()
+
+
 def metadata_from_file(file: str, vars: dict) -> str:
     """
     Read a file and replace placeholders in the content with the values in kwargs
     """
     logger.info(f"Reading metadata: {file}")
-    with open(file, "r") as f:
-        return metadata(f.read(), vars)
+    try:
+        stat = os.stat(file)
+    except OSError:
+        # Leave it to open() to report the problem
+        with open(file, "r") as f:
+            return metadata(f.read(), vars)
+    template = _read_template(os.path.abspath(file), stat.st_mtime_ns, stat.st_size)
+    return metadata(template, vars)
 
 
 def is_template_variable(value: str) -> bool:
@@ -64,7 +82,8 @@ def metadata_from_toml(file: str, vars: dict = {}) -> dict:
     """
     metadata_string = metadata_from_file(file, vars)
     cleaned = cleanup_metadata(toml.loads(metadata_string))
-    logger.debug(f"Cleaned metadata: {cleaned}")
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug(f"Cleaned metadata: {cleaned}")
     if not cleaned:
         raise ValueError("Metadata is empty")
     if not validate_metadata(cleaned):
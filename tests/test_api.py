@@ -1,14 +1,37 @@
 import pytest
 import os
-from unittest.mock import patch
+import requests
+import io
+import zipfile
+import mmap
+import hashlib
+from unittest.mock import MagicMock, patch
 from zenodo_deposit.api import (
     create_deposition,
     add_file,
+    add_url,
+    add_directory,
+    add_zipped_directory,
+    file_list,
+    zip_members,
+    zip_size,
+    zip_stream,
+    file_md5,
+    already_uploaded,
     add_metadata,
     publish_deposition,
     update_metadata,
     delete_deposition,
     get_deposition,
+    access_token,
+    make_session,
+    CircuitBreaker,
+    CircuitOpenError,
+    make_client,
+    path_kind,
+    upload,
+    create_new_version,
+    search,
 )
 
 
@@ -52,19 +75,31 @@ def file_response():
 
 
 def test_create_deposition(base_url, params, deposition_response):
-    with patch("requests.post") as mock_post:
+    with patch("zenodo_deposit.api._SESSION.post") as mock_post:
         mock_post.return_value.status_code = 201
         mock_post.return_value.json.return_value = deposition_response
 
         response = create_deposition(base_url, params)
         assert response == deposition_response
+        assert mock_post.call_args.kwargs["json"] == {}
+
+
+def test_create_deposition_with_metadata(base_url, params, deposition_response):
+    metadata = {"title": "My first upload"}
+    with patch("zenodo_deposit.api._SESSION.post") as mock_post:
+        mock_post.return_value.status_code = 201
+        mock_post.return_value.json.return_value = deposition_response
+
+        response = create_deposition(base_url, params, metadata=metadata)
+        assert response == deposition_response
+        assert mock_post.call_args.kwargs["json"] == {"metadata": metadata}
 
 
 def test_deposit_file(base_url, params, file_response):
     bucket_url = "https://sandbox.zenodo.org/api/files/12345"
     file_path = os.path.join(TEST_DATA_PATH, "Combined.xls")
 
-    with patch("requests.put") as mock_put:
+    with patch("zenodo_deposit.api._SESSION.put") as mock_put:
         mock_put.return_value.status_code = 200
         mock_put.return_value.json.return_value = file_response
 
@@ -72,6 +107,195 @@ def test_deposit_file(base_url, params, file_response):
         assert response == file_response
 
 
+def test_deposit_large_file_uses_mmap(tmp_path, params, file_response):
+    bucket_url = "https://sandbox.zenodo.org/api/files/12345"
+    file_path = tmp_path / "large.bin"
+    file_path.write_bytes(b"x" * 1024)
+
+    with patch("zenodo_deposit.api.MMAP_THRESHOLD", 1024), patch(
+        "zenodo_deposit.api._SESSION.put"
+    ) as mock_put:
+        mock_put.return_value.json.return_value = file_response
+
+        response = add_file(bucket_url, file_path, params)
+        assert response == file_response
+        assert isinstance(mock_put.call_args.kwargs["data"], mmap.mmap)
+        assert mock_put.call_args.kwargs["headers"]["Content-Length"] == "1024"
+
+
+class UnsizedStream(io.RawIOBase):
+    """
+    Readable stream that, like a socket, cannot tell requests its length.
+    """
+
+    def __init__(self, data):
+        self._data = io.BytesIO(data)
+
+    def readable(self):
+        return True
+
+    def readinto(self, b):
+        return self._data.readinto(b)
+
+
+def test_add_url(params, file_response):
+    bucket_url = "https://sandbox.zenodo.org/api/files/12345"
+    url = "https://example.org/data/Combined.xls"
+    sent = {}
+
+    def fake_send(request, **kwargs):
+        sent["request"] = request
+        sent["body"] = request.body.read()
+        response = MagicMock(status_code=200)
+        response.json.return_value = file_response
+        return response
+
+    with patch("zenodo_deposit.api._SESSION.get") as mock_get, \
+            patch("zenodo_deposit.api._SESSION.send", side_effect=fake_send):
+        source = mock_get.return_value.__enter__.return_value
+        source.headers = {"Content-Length": "5"}
+        source.raw = UnsizedStream(b"hello")
+
+        response = add_url(bucket_url, url, params)
+        assert response == file_response
+    request = sent["request"]
+    assert request.url.startswith(f"{bucket_url}/Combined.xls")
+    assert request.headers["Content-Length"] == "5"
+    assert "Transfer-Encoding" not in request.headers
+    assert sent["body"] == b"hello"
+
+
+def test_add_directory(tmp_path, params, file_response):
+    bucket_url = "https://sandbox.zenodo.org/api/files/12345"
+    for name in ["a.txt", "b.txt", "c.txt"]:
+        (tmp_path / name).write_text(name)
+
+    with patch("zenodo_deposit.api._SESSION.put") as mock_put:
+        mock_put.return_value.status_code = 200
+        mock_put.return_value.json.return_value = file_response
+
+        response = add_directory(bucket_url, tmp_path, params, max_workers=2)
+        assert response == [file_response] * 3
+        assert mock_put.call_count == 3
+
+
+def test_add_directory_zips_small_files(tmp_path, params, file_response):
+    bucket_url = "https://sandbox.zenodo.org/api/files/12345"
+    for index in range(25):
+        (tmp_path / f"{index}.txt").write_text(str(index))
+
+    with patch("zenodo_deposit.api.add_zipped_directory", return_value=file_response) as mock_zip, \
+            patch("zenodo_deposit.api.add_file") as mock_add_file:
+        response = add_directory(bucket_url, tmp_path, params, zip_below_bytes=1024)
+        assert response == [file_response]
+        mock_zip.assert_called_once()
+        mock_add_file.assert_not_called()
+
+
+@pytest.mark.parametrize("zip_below_bytes, existing", [(0, None), (1024, {})])
+def test_add_directory_keeps_small_files(tmp_path, params, file_response, zip_below_bytes, existing):
+    bucket_url = "https://sandbox.zenodo.org/api/files/12345"
+    for index in range(25):
+        (tmp_path / f"{index}.txt").write_text(str(index))
+
+    with patch("zenodo_deposit.api.add_zipped_directory") as mock_zip, \
+            patch("zenodo_deposit.api.add_file", return_value=file_response) as mock_add_file:
+        response = add_directory(
+            bucket_url, tmp_path, params, existing=existing, zip_below_bytes=zip_below_bytes
+        )
+        assert response == [file_response] * 25
+        mock_zip.assert_not_called()
+        assert mock_add_file.call_count == 25
+
+
+def test_upload_passes_zip_thresholds_to_directories(tmp_path, params, deposition_response):
+    (tmp_path / "a.txt").write_text("a")
+
+    with patch("zenodo_deposit.api.access_token", return_value="token"), \
+            patch("zenodo_deposit.api.create_deposition", return_value=deposition_response), \
+            patch("zenodo_deposit.api.add_directory") as mock_add_directory:
+        upload([str(tmp_path)], {"title": "Directory"}, params, max_files=10, zip_below_bytes=0)
+        kwargs = mock_add_directory.call_args.kwargs
+        assert kwargs["max_files"] == 10
+        assert kwargs["zip_below_bytes"] == 0
+
+
+def test_add_zipped_directory(tmp_path, params, file_response):
+    bucket_url = "https://sandbox.zenodo.org/api/files/12345"
+    data = tmp_path / "data"
+    (data / "nested").mkdir(parents=True)
+    (data / "a.txt").write_text("a")
+    (data / "nested" / "b.txt").write_text("b")
+    uploaded = {}
+
+    def fake_put(url, data, params):
+        with zipfile.ZipFile(io.BytesIO(b"".join(data))) as z:
+            uploaded["names"] = sorted(z.namelist())
+            uploaded["compression"] = {i.compress_type for i in z.infolist()}
+        response = MagicMock(status_code=200)
+        response.json.return_value = file_response
+        return response
+
+    with patch("zenodo_deposit.api._SESSION.put", side_effect=fake_put):
+        response = add_zipped_directory(bucket_url, data, params)
+        assert response == file_response
+    assert uploaded["names"] == ["a.txt", "nested/b.txt"]
+    assert uploaded["compression"] == {zipfile.ZIP_STORED}
+
+
+@pytest.mark.parametrize(
+    "limits",
+    [
+        {"ZIP64_LIMIT": zipfile.ZIP64_LIMIT},
+        {"ZIP64_LIMIT": 100},
+        {"ZIP64_LIMIT": 3000},
+        {"ZIP_FILECOUNT_LIMIT": 2},
+    ],
+)
+def test_zip_size_matches_stream(tmp_path, limits):
+    data = tmp_path / "data"
+    (data / "nested").mkdir(parents=True)
+    (data / "empty.txt").write_bytes(b"")
+    (data / "caf\u00e9.csv").write_bytes(b"x" * 1000)
+    (data / "nested" / "b.bin").write_bytes(os.urandom(2000))
+    members = zip_members(data, file_list(data))
+
+    with patch.multiple("zipfile", **limits):
+        archive = b"".join(zip_stream(members))
+        assert zip_size(members) == len(archive)
+    with zipfile.ZipFile(io.BytesIO(archive)) as z:
+        assert z.testzip() is None
+
+
+def test_add_zipped_directory_sends_content_length(tmp_path, params, file_response):
+    bucket_url = "https://sandbox.zenodo.org/api/files/12345"
+    (tmp_path / "a.txt").write_text("a")
+    sent = {}
+
+    def fake_send(request, **kwargs):
+        sent["request"] = request
+        sent["body"] = b"".join(request.body)
+        response = MagicMock(status_code=200)
+        response.json.return_value = file_response
+        return response
+
+    with patch("zenodo_deposit.api._SESSION.send", side_effect=fake_send):
+        add_zipped_directory(bucket_url, tmp_path, params, name="data")
+    headers = sent["request"].headers
+    assert headers["Content-Length"] == str(len(sent["body"]))
+    assert "Transfer-Encoding" not in headers
+
+
+def test_file_list(tmp_path):
+    (tmp_path / "nested" / "deeper").mkdir(parents=True)
+    (tmp_path / "a.txt").write_text("a")
+    (tmp_path / "nested" / "b.txt").write_text("b")
+    (tmp_path / "nested" / "deeper" / "c.txt").write_text("c")
+    files = sorted(f.relative_to(tmp_path).as_posix() for f in file_list(tmp_path))
+    assert files == ["a.txt", "nested/b.txt", "nested/deeper/c.txt"]
+    assert file_list(tmp_path / "a.txt") == [tmp_path / "a.txt"]
+
+
 def test_add_metadata(base_url, params, deposition_response):
     deposition_id = 12345
     metadata = {
@@ -81,19 +305,49 @@ def test_add_metadata(base_url, params, deposition_response):
         "creators": [{"name": "Doe, John", "affiliation": "Zenodo"}],
     }
 
-    with patch("requests.get") as mock_get, patch("requests.put") as mock_put:
+    with patch("zenodo_deposit.api._SESSION.get") as mock_get, patch("zenodo_deposit.api._SESSION.put") as mock_put:
         mock_get.return_value.status_code = 200
         mock_get.return_value.json.return_value = {"id": deposition_id, "metadata": {}}
         mock_put.return_value.status_code = 200
         mock_put.return_value.json.return_value = deposition_response
         response = add_metadata(base_url, deposition_id, metadata, params)
         assert response == deposition_response
+        assert mock_put.call_args.kwargs["json"] == {"metadata": metadata}
+
+
+def test_add_metadata_with_known_deposition(base_url, params, deposition_response):
+    deposition = {"id": 12345, "metadata": {"keywords": ["air"]}}
+
+    with patch("zenodo_deposit.api._SESSION.get") as mock_get, patch("zenodo_deposit.api._SESSION.put") as mock_put:
+        mock_put.return_value.json.return_value = deposition_response
+        add_metadata(base_url, 12345, {"keywords": ["air", "water"]}, params, deposition=deposition)
+        mock_get.assert_not_called()
+        assert mock_put.call_args.kwargs["json"] == {"metadata": {"keywords": ["air", "water"]}}
+
+
+def test_add_metadata_retries_fetch_once(base_url, params):
+    error = requests.exceptions.ConnectionError("Connection reset")
+    with patch("zenodo_deposit.api._SESSION.get", side_effect=error) as mock_get, patch("time.sleep"):
+        with pytest.raises(requests.exceptions.ConnectionError):
+            add_metadata(base_url, 12345, {"title": "Title"}, params)
+        assert mock_get.call_count == 6
+
+
+def test_add_metadata_merges_creators(base_url, params, deposition_response):
+    doe = {"name": "Doe, John", "affiliation": "Zenodo"}
+    roe = {"name": "Roe, Jane", "affiliation": "EDGI", "orcid": "0000-0002-1825-0097"}
+    deposition = {"id": 12345, "metadata": {"creators": [doe]}}
+
+    with patch("zenodo_deposit.api._SESSION.put") as mock_put:
+        mock_put.return_value.json.return_value = deposition_response
+        add_metadata(base_url, 12345, {"creators": [dict(doe), roe, roe]}, params, deposition=deposition)
+        assert mock_put.call_args.kwargs["json"] == {"metadata": {"creators": [doe, roe]}}
 
 
 def test_publish_deposition(base_url, params, deposition_response):
     deposition_id = 12345
 
-    with patch("requests.post") as mock_post:
+    with patch("zenodo_deposit.api._SESSION.post") as mock_post:
         mock_post.return_value.status_code = 202
         mock_post.return_value.json.return_value = deposition_response
 
@@ -101,7 +355,182 @@ def test_publish_deposition(base_url, params, deposition_response):
         assert response == deposition_response
 
 
-# TODO: Add test for upload function
+def test_publish_deposition_uses_given_session(base_url, params, deposition_response):
+    session = MagicMock()
+    session.post.return_value.json.return_value = deposition_response
+
+    with patch("zenodo_deposit.api._SESSION.post") as mock_post:
+        response = publish_deposition(base_url, 12345, params, session=session)
+        assert response == deposition_response
+        session.post.assert_called_once()
+        mock_post.assert_not_called()
+
+
+def test_publish_deposition_retries_rate_limits(base_url, params, deposition_response):
+    deposition_id = 12345
+    rate_limited = MagicMock(status_code=429)
+    error = requests.exceptions.HTTPError(response=rate_limited)
+
+    with patch("zenodo_deposit.api._SESSION.post") as mock_post, patch("time.sleep"):
+        mock_post.return_value.raise_for_status.side_effect = [error, None]
+        mock_post.return_value.json.return_value = deposition_response
+
+        response = publish_deposition(base_url, deposition_id, params)
+        assert response == deposition_response
+        assert mock_post.call_count == 2
+
+
+def test_publish_deposition_gives_up_on_client_errors(base_url, params):
+    deposition_id = 12345
+    bad_request = MagicMock(status_code=400)
+    error = requests.exceptions.HTTPError(response=bad_request)
+
+    with patch("zenodo_deposit.api._SESSION.post") as mock_post:
+        mock_post.return_value.raise_for_status.side_effect = error
+
+        with pytest.raises(requests.exceptions.HTTPError):
+            publish_deposition(base_url, deposition_id, params)
+        assert mock_post.call_count == 1
+
+
+@pytest.mark.parametrize(
+    "error",
+    [
+        requests.exceptions.HTTPError(response=MagicMock(status_code=502)),
+        requests.exceptions.ReadTimeout(),
+        requests.exceptions.ConnectionError("Connection aborted"),
+    ],
+)
+def test_create_deposition_does_not_retry_ambiguous_failures(base_url, params, error):
+    with patch("zenodo_deposit.api._SESSION.post", side_effect=error) as mock_post:
+        with pytest.raises(type(error)):
+            create_deposition(base_url, params)
+        assert mock_post.call_count == 1
+
+
+def test_create_deposition_retries_unsent_requests(base_url, params, deposition_response):
+    with patch("zenodo_deposit.api._SESSION.post") as mock_post, patch("time.sleep"):
+        mock_post.return_value.status_code = 201
+        mock_post.return_value.json.return_value = deposition_response
+        mock_post.side_effect = [requests.exceptions.ConnectTimeout(), mock_post.return_value]
+
+        response = create_deposition(base_url, params)
+        assert response == deposition_response
+        assert mock_post.call_count == 2
+
+
+def test_retry_gives_up_on_permanent_request_errors(base_url, params):
+    error = requests.exceptions.InvalidURL("bad url")
+    with patch("zenodo_deposit.api._SESSION.get", side_effect=error) as mock_get:
+        with pytest.raises(requests.exceptions.InvalidURL):
+            get_deposition(12345, base_url=base_url, params={"access_token": "token"})
+        assert mock_get.call_count == 1
+
+
+def test_upload(params, deposition_response, file_response):
+    file_path = os.path.join(TEST_DATA_PATH, "Combined.xls")
+    metadata = {"title": "My first upload"}
+
+    with patch("zenodo_deposit.api.access_token", return_value="token"), \
+            patch("zenodo_deposit.api.create_deposition", return_value=deposition_response) as mock_create, \
+            patch("zenodo_deposit.api.add_metadata") as mock_add_metadata, \
+            patch("zenodo_deposit.api.add_file", return_value=file_response) as mock_add_file, \
+            patch("zenodo_deposit.api.publish_deposition") as mock_publish:
+        response = upload([file_path], metadata, params)
+        assert response == deposition_response
+        assert mock_create.call_args.kwargs["metadata"] == metadata
+        mock_add_metadata.assert_not_called()
+        mock_add_file.assert_called_once()
+        mock_publish.assert_not_called()
+
+
+def test_upload_several_paths(params, deposition_response, file_response):
+    paths = [
+        os.path.join(TEST_DATA_PATH, "Combined.xls"),
+        "https://example.org/data/Combined.xls",
+    ]
+
+    with patch("zenodo_deposit.api.access_token", return_value="token"), \
+            patch("zenodo_deposit.api.create_deposition", return_value=deposition_response), \
+            patch("zenodo_deposit.api.add_metadata"), \
+            patch("zenodo_deposit.api.add_file", return_value=file_response) as mock_add_file, \
+            patch("zenodo_deposit.api.add_url", return_value=file_response) as mock_add_url:
+        response = upload(paths, {"title": "Two things"}, params)
+        assert response == deposition_response
+        mock_add_file.assert_called_once()
+        mock_add_url.assert_called_once()
+
+
+def test_upload_resumes_existing_deposition(params, deposition_response, file_response):
+    file_path = os.path.join(TEST_DATA_PATH, "Combined.xls")
+    uploaded = {
+        "Combined.xls": {
+            **file_response,
+            "size": os.path.getsize(file_path),
+            "checksum": file_md5(file_path),
+        }
+    }
+
+    with patch("zenodo_deposit.api.access_token", return_value="token"), \
+            patch("zenodo_deposit.api.get_deposition", return_value=deposition_response), \
+            patch("zenodo_deposit.api.bucket_files", return_value=uploaded), \
+            patch("zenodo_deposit.api.create_deposition") as mock_create, \
+            patch("zenodo_deposit.api.add_metadata") as mock_add_metadata, \
+            patch("zenodo_deposit.api.add_file") as mock_add_file:
+        response = upload([file_path], {}, params, deposition_id=12345)
+        assert response == deposition_response
+        mock_create.assert_not_called()
+        mock_add_metadata.assert_called_once()
+        mock_add_file.assert_not_called()
+
+
+def test_already_uploaded_compares_checksums(tmp_path):
+    file_path = tmp_path / "data.csv"
+    file_path.write_bytes(b"a,b\n1,2\n")
+    entry = {"key": "data.csv", "size": 8, "checksum": file_md5(file_path)}
+    assert file_md5(file_path) == "md5:" + hashlib.md5(b"a,b\n1,2\n").hexdigest()
+    assert already_uploaded(file_path, "data.csv", {"data.csv": entry}) == entry
+    changed = {**entry, "checksum": "md5:00000000000000000000000000000000"}
+    assert already_uploaded(file_path, "data.csv", {"data.csv": changed}) is None
+    assert already_uploaded(file_path, "other.csv", {"data.csv": entry}) is None
+
+
+def test_create_new_version(base_url, params, deposition_response, file_response):
+    paths = [os.path.join(TEST_DATA_PATH, "Combined.xls"), "https://example.org/data.csv"]
+    new_version = {"links": {"latest_draft": f"{base_url}/deposit/depositions/67890"}}
+
+    with patch("zenodo_deposit.api._SESSION.post") as mock_post, \
+            patch("zenodo_deposit.api.get_deposition", return_value=deposition_response), \
+            patch("zenodo_deposit.api.bucket_files", return_value={}), \
+            patch("zenodo_deposit.api.add_file", return_value=file_response) as mock_add_file, \
+            patch("zenodo_deposit.api.add_url", return_value=file_response) as mock_add_url:
+        mock_post.return_value.json.return_value = new_version
+        response = create_new_version(
+            base_url, 12345, params, params, files_to_add=paths
+        )
+        assert response == new_version
+        mock_add_file.assert_called_once()
+        mock_add_url.assert_called_once()
+
+
+def test_create_new_version_missing_path(base_url, params):
+    with patch("zenodo_deposit.api._SESSION.post") as mock_post:
+        with pytest.raises(ValueError, match="Path does not exist"):
+            create_new_version(
+                base_url,
+                12345,
+                params,
+                params,
+                files_to_add=[os.path.join(TEST_DATA_PATH, "missing.xls")],
+            )
+        mock_post.assert_not_called()
+
+
+def test_upload_missing_path(params):
+    with patch("zenodo_deposit.api.create_deposition") as mock_create:
+        with pytest.raises(ValueError, match="Path does not exist"):
+            upload([os.path.join(TEST_DATA_PATH, "missing.xls")], {}, params)
+        mock_create.assert_not_called()
 
 
 def test_update_metadata(base_url, params, deposition_response):
@@ -113,7 +542,7 @@ def test_update_metadata(base_url, params, deposition_response):
         "creators": [{"name": "Doe, John", "affiliation": "Zenodo"}],
     }
 
-    with patch("requests.put") as mock_put:
+    with patch("zenodo_deposit.api._SESSION.put") as mock_put:
         mock_put.return_value.status_code = 200
         mock_put.return_value.json.return_value = deposition_response
 
@@ -124,7 +553,7 @@ def test_update_metadata(base_url, params, deposition_response):
 def test_delete_deposition(base_url, params):
     deposition_id = 12345
 
-    with patch("requests.delete") as mock_delete:
+    with patch("zenodo_deposit.api._SESSION.delete") as mock_delete:
         mock_delete.return_value.status_code = 204
 
         response = delete_deposition(base_url, deposition_id, params)
@@ -134,8 +563,118 @@ def test_delete_deposition(base_url, params):
 def test_get_deposition(base_url, params, deposition_response):
     deposition_id = 12345
 
-    with patch("requests.get") as mock_get:
+    with patch("zenodo_deposit.api._SESSION.get") as mock_get:
         mock_get.return_value.status_code = 200
         mock_get.return_value.json.return_value = deposition_response
         response = get_deposition(deposition_id, params)
         assert response == deposition_response
+
+
+def test_make_session():
+    session = make_session()
+    adapter = session.get_adapter("https://sandbox.zenodo.org/api")
+    assert adapter._pool_maxsize == 32
+
+
+def test_session_sends_token_as_header():
+    session = make_session()
+    with patch("requests.Session.send") as mock_send:
+        mock_send.return_value.status_code = 200
+        session.get(
+            "https://sandbox.zenodo.org/api/records",
+            params={"access_token": "secret", "q": "title:test"},
+        )
+        request = mock_send.call_args.args[0]
+        assert request.url == "https://sandbox.zenodo.org/api/records?q=title%3Atest"
+        assert request.headers["Authorization"] == "Bearer secret"
+
+
+def test_session_keeps_positional_arguments():
+    session = make_session()
+    with patch("requests.Session.send") as mock_send:
+        mock_send.return_value.status_code = 200
+        session.request(
+            "PUT",
+            "https://sandbox.zenodo.org/api/files/12345/a.txt",
+            {"access_token": "secret"},
+            b"data",
+            {"Content-Type": "text/plain"},
+        )
+        request = mock_send.call_args.args[0]
+        assert request.url == "https://sandbox.zenodo.org/api/files/12345/a.txt"
+        assert request.body == b"data"
+        assert request.headers["Content-Type"] == "text/plain"
+        assert request.headers["Authorization"] == "Bearer secret"
+
+
+def test_circuit_breaker_opens_after_failures():
+    breaker = CircuitBreaker(fail_max=2, reset_timeout=60)
+    breaker.record(False)
+    breaker.before_request("https://zenodo.org/api")
+    breaker.record(False)
+    with pytest.raises(CircuitOpenError):
+        breaker.before_request("https://zenodo.org/api")
+
+
+def test_circuit_breaker_probes_after_timeout():
+    breaker = CircuitBreaker(fail_max=1, reset_timeout=0)
+    breaker.record(False)
+    breaker.before_request("https://zenodo.org/api")
+    breaker.record(True)
+    assert breaker.opened_at is None
+
+
+def test_session_fails_fast_when_circuit_open():
+    session = make_session()
+    with patch("requests.Session.request") as mock_request:
+        mock_request.return_value.status_code = 503
+        for _ in range(5):
+            session.get("https://sandbox.zenodo.org/api/records")
+        with pytest.raises(CircuitOpenError):
+            session.get("https://sandbox.zenodo.org/api/records")
+        assert mock_request.call_count == 5
+        mock_request.return_value.status_code = 200
+        session.get("https://example.org/data.csv")
+        assert mock_request.call_count == 6
+    assert set(session.breakers) == {"sandbox.zenodo.org", "example.org"}
+
+
+def test_path_kind(tmp_path):
+    file_path = tmp_path / "data.csv"
+    file_path.write_text("a,b")
+    assert path_kind("https://example.org/data.csv") == "url"
+    assert path_kind(str(file_path)) == "file"
+    assert path_kind(str(tmp_path)) == "dir"
+    assert path_kind(str(tmp_path / "missing.csv")) is None
+
+
+def test_access_token():
+    config = {"ZENODO_SANDBOX_ACCESS_TOKEN": "sandbox_token"}
+    with patch("zenodo_deposit.api._SESSION.request") as mock_request:
+        assert access_token(config) == "sandbox_token"
+        mock_request.assert_not_called()
+    with pytest.raises(ValueError, match="ZENODO_ACCESS_TOKEN"):
+        access_token(config, sandbox=False)
+
+
+def test_make_client():
+    config = {"ZENODO_SANDBOX_ACCESS_TOKEN": "sandbox_token"}
+    client = make_client(config, sandbox=True)
+    assert client.base_url == "https://sandbox.zenodo.org/api"
+    assert client.params == {"access_token": "sandbox_token"}
+
+
+def test_search(params):
+    with patch("zenodo_deposit.api.access_token", return_value="token"), \
+            patch("zenodo_deposit.api._SESSION.get") as mock_get:
+        mock_get.return_value.json.return_value = {"hits": {"hits": []}}
+        response = search("title:test", status="published", sort="mostrecent", config=params)
+        assert response == {"hits": {"hits": []}}
+        sent = mock_get.call_args.kwargs["params"]
+        assert sent["status"] == "published"
+        assert sent["sort"] == "mostrecent"
+
+        with pytest.raises(ValueError, match="Invalid status value"):
+            search("title:test", status="unknown", config=params)
+        with pytest.raises(ValueError, match="Invalid sort value"):
+            search("title:test", sort="oldest", config=params)
@@ -0,0 +1,120 @@
+import json
+import os
+import click
+import pytest
+import requests
+from unittest.mock import patch
+from click.testing import CliRunner
+from zenodo_deposit.api import CircuitOpenError
+from zenodo_deposit.cli import api_errors, cli
+
+
+TEST_DATA_LOCATION = "test_data"
+current_dir = os.path.dirname(os.path.abspath(__file__))
+TEST_DATA_PATH = os.path.join(current_dir, TEST_DATA_LOCATION)
+METADATA_PATH = os.path.join(TEST_DATA_PATH, "metadata_Combined.toml")
+FILE_PATH = os.path.join(TEST_DATA_PATH, "Combined.xls")
+
+TOKEN = "a1B2_c3D4-" * 4
+
+
+@pytest.fixture
+def config_args(tmp_path):
+    path = tmp_path / "settings.toml"
+    path.write_text(f'[zenodo]\nZENODO_SANDBOX_ACCESS_TOKEN = "{TOKEN}"\n')
+    return ["--config-file", str(path)]
+
+
+@pytest.fixture
+def deposition_response():
+    return {
+        "id": 12345,
+        "links": {"bucket": "https://sandbox.zenodo.org/api/files/12345"},
+    }
+
+
+def invoke(config_args, *args):
+    return CliRunner().invoke(cli, [*config_args, *args])
+
+
+def http_error(status_code, message):
+    response = requests.Response()
+    response.status_code = status_code
+    response._content = json.dumps({"message": message}).encode()
+    return requests.exceptions.HTTPError(response=response)
+
+
+def test_create(config_args, deposition_response):
+    with patch("zenodo_deposit.api.create_deposition", return_value=deposition_response) as mock_create:
+        result = invoke(config_args, "create", "-m", METADATA_PATH, "-k", "rmp, epa", "-k", "air")
+    assert result.exit_code == 0, result.output
+    assert json.loads(result.stdout) == deposition_response
+    args, kwargs = mock_create.call_args
+    assert args == ("https://sandbox.zenodo.org/api", {"access_token": TOKEN})
+    assert kwargs["metadata"]["title"] == "Test Title"
+    assert kwargs["metadata"]["keywords"] == ["rmp", "epa", "air"]
+
+
+def test_create_reports_api_errors(config_args):
+    error = http_error(400, "Validation error")
+    with patch("zenodo_deposit.api.create_deposition", side_effect=error):
+        result = invoke(config_args, "create", "-m", METADATA_PATH)
+    assert result.exit_code == 1
+    assert "Failed to create deposition: Validation error" in result.output
+
+
+def test_upload(config_args, deposition_response):
+    with patch("zenodo_deposit.api.upload", return_value=deposition_response) as mock_upload:
+        result = invoke(config_args, "upload", "-m", METADATA_PATH, "--title", "New title", FILE_PATH)
+    assert result.exit_code == 0, result.output
+    assert json.loads(result.stdout) == deposition_response
+    kwargs = mock_upload.call_args.kwargs
+    assert kwargs["paths"] == (FILE_PATH,)
+    assert kwargs["metadata"]["title"] == "New title"
+    assert kwargs["sandbox"] is True
+    assert kwargs["deposition_id"] is None
+
+
+def test_upload_resumes_deposition(config_args, deposition_response):
+    with patch("zenodo_deposit.api.upload", return_value=deposition_response) as mock_upload:
+        result = invoke(config_args, "upload", "-m", METADATA_PATH, "--deposition-id", "12345", FILE_PATH)
+    assert result.exit_code == 0, result.output
+    assert mock_upload.call_args.kwargs["deposition_id"] == 12345
+
+
+def test_upload_missing_file(config_args, tmp_path):
+    with patch("zenodo_deposit.api.create_deposition") as mock_create:
+        result = invoke(config_args, "upload", "-m", METADATA_PATH, str(tmp_path / "missing.csv"))
+    assert result.exit_code == 1
+    assert "Path does not exist" in result.output
+    mock_create.assert_not_called()
+
+
+def test_new_version(config_args, deposition_response):
+    base = {
+        "metadata": {
+            "title": "Old title",
+            "creators": [{"name": "Fitzgerald, Will"}],
+            "upload_type": "dataset",
+        }
+    }
+    new_version = {"links": {"latest_draft": "https://sandbox.zenodo.org/api/deposit/depositions/67890"}}
+    with patch("zenodo_deposit.api.get_deposition", return_value=base), \
+            patch("zenodo_deposit.api.create_new_version", return_value=new_version) as mock_new_version, \
+            patch("zenodo_deposit.api.update_metadata", return_value=deposition_response) as mock_update:
+        result = invoke(config_args, "new_version", "12345", "--title", "New title", FILE_PATH)
+    assert result.exit_code == 0, result.output
+    assert json.loads(result.stdout) == deposition_response
+    assert mock_new_version.call_args.kwargs["files_to_add"] == (FILE_PATH,)
+    args = mock_update.call_args.args
+    assert args[1] == "67890"
+    assert args[2]["title"] == "New title"
+
+
+def test_api_errors_reports_open_circuit():
+    @api_errors("Failed to publish")
+    def command():
+        raise CircuitOpenError("Circuit open, not sending request to https://zenodo.org")
+
+    with pytest.raises(click.ClickException, match="Failed to publish: Circuit open"):
+        command()
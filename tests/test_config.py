@@ -1,15 +1,20 @@
 import pytest
 import os
-from unittest.mock import patch, mock_open
+from unittest.mock import patch
 from zenodo_deposit.config import (
     zenodo_config,
     config_section,
+    validate_zenodo_config,
+    _load_toml,
+    _check_token_format,
 )
 
 
 @pytest.fixture(autouse=True)
 def clear_cache():
     config_section.cache_clear()
+    _load_toml.cache_clear()
+    _check_token_format.cache_clear()
 
 
 def test_default_config():
@@ -17,44 +22,80 @@ def test_default_config():
     assert result  # returns a dictionary
 
 
-def test_config_file():
-    with patch(
-        "builtins.open",
-        mock_open(read_data=b'[zenodo]\n"ZENODO_ACCESS_TOKEN" =  "new_token"'),
-    ):
-        with patch("os.path.exists", return_value=True):
-            result = zenodo_config(config_file="dummy_path")
-            assert result["ZENODO_ACCESS_TOKEN"] == "new_token"
-
-
-def test_local_settings():
-    with patch(
-        "builtins.open",
-        mock_open(read_data=b'[zenodo]\n"ZENODO_ACCESS_TOKEN" = "local_token"'),
-    ):
-        with patch(
-            "os.path.exists",
-            side_effect=lambda path: path == ".zenodo-deposit-settings.toml",
-        ):
-            result = zenodo_config()
-            assert result["ZENODO_ACCESS_TOKEN"] == "local_token"
-
-
-def test_user_settings():
-    with patch(
-        "builtins.open",
-        mock_open(read_data=b'[zenodo]\n"ZENODO_ACCESS_TOKEN" = "user_token"'),
-    ):
-        with patch(
-            "os.path.exists",
-            side_effect=lambda path: path
-            == os.path.expanduser("~/.zenodo-deposit-settings.toml"),
-        ):
-            result = zenodo_config()
-            assert result["ZENODO_ACCESS_TOKEN"] == "user_token"
+def test_config_file(tmp_path):
+    path = tmp_path / "zenodo.toml"
+    path.write_bytes(b'[zenodo]\n"ZENODO_ACCESS_TOKEN" =  "new_token"')
+    result = zenodo_config(config_file=str(path))
+    assert result["ZENODO_ACCESS_TOKEN"] == "new_token"
+
+
+def test_local_settings(tmp_path, monkeypatch):
+    (tmp_path / ".zenodo-deposit-settings.toml").write_bytes(
+        b'[zenodo]\n"ZENODO_ACCESS_TOKEN" = "local_token"'
+    )
+    monkeypatch.chdir(tmp_path)
+    result = zenodo_config()
+    assert result["ZENODO_ACCESS_TOKEN"] == "local_token"
+
+
+def test_user_settings(tmp_path, monkeypatch):
+    home = tmp_path / "home"
+    home.mkdir()
+    (home / ".zenodo-deposit-settings.toml").write_bytes(
+        b'[zenodo]\n"ZENODO_ACCESS_TOKEN" = "user_token"'
+    )
+    monkeypatch.setattr(
+        "zenodo_deposit.config._DEFAULT_CONFIG_PATHS",
+        (".zenodo-deposit-settings.toml", str(home / ".zenodo-deposit-settings.toml")),
+    )
+    monkeypatch.chdir(tmp_path)
+    result = zenodo_config()
+    assert result["ZENODO_ACCESS_TOKEN"] == "user_token"
+
+
+def test_missing_section(tmp_path):
+    path = tmp_path / "zenodo.toml"
+    path.write_bytes(b'[other]\nKEY = "value"\n')
+    with pytest.raises(ValueError):
+        zenodo_config(config_file=str(path))
 
 
 def test_environment_variable():
     with patch.dict(os.environ, {"ZENODO_ACCESS_TOKEN": "env_token"}):
         result = zenodo_config()
         assert result["ZENODO_ACCESS_TOKEN"] == "env_token"
+
+
+def test_config_file_rereads_changed_file(tmp_path):
+    path = tmp_path / "settings.toml"
+    path.write_bytes(b'[zenodo]\nZENODO_ACCESS_TOKEN = "first"\n')
+    assert zenodo_config(config_file=str(path))["ZENODO_ACCESS_TOKEN"] == "first"
+    path.write_bytes(b'[zenodo]\nZENODO_ACCESS_TOKEN = "second"\n')
+    os.utime(path, ns=(0, 0))
+    assert zenodo_config(config_file=str(path))["ZENODO_ACCESS_TOKEN"] == "second"
+    assert _load_toml.cache_info().currsize == 2
+
+
+def test_config_section_resolves_path(tmp_path, monkeypatch):
+    (tmp_path / "settings.toml").write_bytes(b'[zenodo]\nZENODO_ACCESS_TOKEN = "token"\n')
+    monkeypatch.chdir(tmp_path)
+    assert config_section("settings.toml") is config_section(str(tmp_path / "settings.toml"))
+
+
+def test_config_section_expands_user(tmp_path, monkeypatch):
+    (tmp_path / "settings.toml").write_bytes(b'[zenodo]\nZENODO_ACCESS_TOKEN = "token"\n')
+    monkeypatch.setenv("HOME", str(tmp_path))
+    assert config_section("~/settings.toml") is config_section(str(tmp_path / "settings.toml"))
+
+
+def test_validate_zenodo_config():
+    token = "a1B2_c3D4-" * 4
+    assert validate_zenodo_config({"ZENODO_ACCESS_TOKEN": f" {token}\n"})
+    assert validate_zenodo_config({"ZENODO_SANDBOX_ACCESS_TOKEN": token}, use_sandbox=True)
+    assert validate_zenodo_config({"ZENODO_SANDBOX_ACCESS_TOKEN": token}, use_sandbox=True)
+    assert _check_token_format.cache_info().hits == 1
+    for bad in ["", "Change me", "short", token + "!"]:
+        with pytest.raises(ValueError):
+            validate_zenodo_config({"ZENODO_ACCESS_TOKEN": bad})
+    with pytest.raises(ValueError):
+        validate_zenodo_config({}, use_sandbox=True)
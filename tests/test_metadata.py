@@ -24,6 +24,15 @@ def test_metadata_from_file():
         assert result == "Hello, World!"
 
 
+def test_metadata_from_file_rereads_changed_file(tmp_path):
+    template = tmp_path / "metadata.toml"
+    template.write_text("Hello, $name!")
+    assert metadata_from_file(template, {"name": "World"}) == "Hello, World!"
+    assert metadata_from_file(template, {"name": "Zenodo"}) == "Hello, Zenodo!"
+    template.write_text("Goodbye, $name!")
+    assert metadata_from_file(template, {"name": "World"}) == "Goodbye, World!"
+
+
 def test_metadata_from_toml_dict():
     toml_content = """
     title = "Hello, $name!"